@@ -3,16 +3,32 @@
 Refactoring Analysis Script
 
 This script analyzes Python files in the repository to identify refactoring opportunities
-based on Martin Fowler's Refactoring catalog using OpenAI's GPT-4 model.
+based on Martin Fowler's Refactoring catalog using OpenAI's GPT models
+(gpt-4o-mini by default, configurable via REFACTOR_MODEL).
 
 The script generates a single HTML report with collapsible sections for each file.
 """
 
 import os
-import glob
+import ast
+import functools
+import time
+import asyncio
+import json
+import hashlib
+import argparse
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import openai
-from pathlib import Path
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+# Try to import tiktoken for exact token counts, but fall back to an estimate if not available
+try:
+    import tiktoken
+    has_tiktoken = True
+except ImportError:
+    has_tiktoken = False
 
 # Configure logging
 logging.basicConfig(
@@ -24,8 +40,66 @@ logger = logging.getLogger(__name__)
 # Constants
 OUTPUT_DIR = 'refactoring-reports'
 OUTPUT_HTML = os.path.join(OUTPUT_DIR, 'refactoring-report.html')
+OUTPUT_CSS = os.path.join(OUTPUT_DIR, 'report.css')
+OUTPUT_JS = os.path.join(OUTPUT_DIR, 'report.js')
+OUTPUT_JSONL = os.path.join(OUTPUT_DIR, 'reports.jsonl')
+MARKED_URL = 'https://cdn.jsdelivr.net/npm/marked@12.0.2/marked.min.js'
+DOMPURIFY_URL = 'https://cdn.jsdelivr.net/npm/dompurify@3.1.6/dist/purify.min.js'
 MAX_FILE_SIZE = 30000  # Skip files larger than 30KB
-MODEL = 'gpt-4'
+FILE_READ_WORKERS = 16
+
+# Directories that are never searched for Python files
+EXCLUDE_DIRS = {'.git', 'venv', '.venv', '__pycache__', '.github', 'node_modules'}
+MODEL = os.environ.get('REFACTOR_MODEL', 'gpt-4o-mini')
+MAX_RESPONSE_TOKENS = 1500
+# Prompt budget per request; larger files are split and analyzed in chunks.
+# The default leaves room for the response within gpt-4's 8K context.
+MAX_INPUT_TOKENS = int(os.environ.get('REFACTOR_MAX_INPUT_TOKENS', '6000'))
+CHUNK_PROMPT_TOKENS = 50  # Allowance for the per-chunk line range note
+
+# Transient API errors are retried with exponential backoff
+MAX_ATTEMPTS = 6
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Small files are analyzed together to share the system prompt across one request
+BATCH_FILE_SIZE = 4000  # Only batch files smaller than 4KB
+BATCH_MAX_SIZE = 12000  # Total size of the files in one batch
+BATCH_MAX_FILES = 8  # Keeps a full batch's response budget within the model's output limit
+
+# On-disk cache of analyses, keyed by model, system prompt and file content
+CACHE_DIR = os.path.join(OUTPUT_DIR, '.cache')
+CACHE_TTL = int(os.environ.get('REFACTOR_CACHE_TTL', str(7 * 24 * 60 * 60)))  # seconds
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, '.manifest.json')
+
+# Concurrency and rate limits for the OpenAI API (overridable via environment)
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('REFACTOR_MAX_CONCURRENCY', '10'))
+MAX_REQUESTS_PER_MINUTE = int(os.environ.get('REFACTOR_MAX_RPM', '500'))
+MAX_TOKENS_PER_MINUTE = int(os.environ.get('REFACTOR_MAX_TPM', '40000'))
+
+# Prompts are kept byte-identical across requests so the provider can cache the shared prefix
+ANALYSIS_INSTRUCTIONS = """You are a code refactoring expert familiar with Martin Fowler's Refactoring catalog.
+Analyze Python code to identify refactoring opportunities. For each opportunity:
+1. Identify the specific refactoring pattern from Fowler's catalog
+2. Specify the function name and line numbers
+3. Explain the code smell that indicates the need for refactoring
+4. Provide a clear recommendation with specific next steps
+5. Include a link to the refactoring pattern documentation
+6. Assign a severity level (High, Medium, Low) based on impact
+"""
+SYSTEM_PROMPT = ANALYSIS_INSTRUCTIONS + """
+Format your response as Markdown with clear headings and bullet points.
+"""
+BATCH_SYSTEM_PROMPT = ANALYSIS_INSTRUCTIONS + """
+Format your response as a JSON object that maps each file path exactly as given to its analysis.
+Write each analysis as Markdown with clear headings and bullet points.
+"""
+USER_PROMPT_PREFIX = "Analyze this Python code and identify refactoring opportunities using Martin Fowler's catalog:\n\n"
+BATCH_PROMPT_PREFIX = (
+    "Analyze each of the following Python files and identify refactoring opportunities using "
+    "Martin Fowler's catalog. Respond only with a JSON object that maps each file path exactly as "
+    "given to its Markdown analysis.\n"
+)
+PROMPT_CACHE_KEY = os.environ.get('GITHUB_REPOSITORY', 'refactoring-analysis')
 
 # HTML Templates
 HTML_HEADER = """
@@ -35,213 +109,472 @@ HTML_HEADER = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Refactoring Analysis Report</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        .file-section {
-            margin-bottom: 20px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            overflow: hidden;
-        }
-        .file-header {
-            background-color: #f5f5f5;
-            padding: 10px 15px;
-            cursor: pointer;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .file-header:hover {
-            background-color: #e9e9e9;
-        }
-        .file-name {
-            font-weight: bold;
-            font-family: monospace;
-        }
-        .file-content {
-            padding: 15px;
-            border-top: 1px solid #ddd;
-            display: none;
-        }
-        .toggle-button {
-            background-color: #4CAF50;
-            color: white;
-            border: none;
-            padding: 5px 10px;
-            text-align: center;
-            text-decoration: none;
-            display: inline-block;
-            font-size: 14px;
-            border-radius: 4px;
-            cursor: pointer;
-        }
-        .toggle-button:hover {
-            background-color: #45a049;
-        }
-        pre {
-            background: #f8f8f8;
-            padding: 10px;
-            overflow-x: auto;
-            border-radius: 4px;
-            border: 1px solid #ddd;
-        }
-        h1, h2, h3 {
-            margin: 0.5em 0;
-        }
-        .summary {
-            margin-bottom: 20px;
-            padding: 15px;
-            background-color: #f0f8ff;
-            border-radius: 4px;
-            border: 1px solid #b8daff;
-        }
-        .toc {
-            margin-bottom: 20px;
-            padding: 15px;
-            background-color: #f5f5f5;
-            border-radius: 4px;
-            border: 1px solid #ddd;
-        }
-        .toc ul {
-            list-style-type: none;
-            padding-left: 10px;
-        }
-        .toc li {
-            margin-bottom: 5px;
-        }
-        .toc a {
-            text-decoration: none;
-            color: #0366d6;
-        }
-        .toc a:hover {
-            text-decoration: underline;
-        }
-        .severity-high {
-            color: #d73a49;
-            font-weight: bold;
-        }
-        .severity-medium {
-            color: #e36209;
-            font-weight: bold;
-        }
-        .severity-low {
-            color: #0366d6;
-            font-weight: bold;
-        }
-    </style>
+    <link rel="stylesheet" href="report.css">
 </head>
 <body>
     <h1>Refactoring Analysis Report</h1>
     <div class="summary">
         <p>This report contains refactoring recommendations based on Martin Fowler's catalog, 
-        generated by GPT-4.</p>
+        generated by OpenAI's GPT models.</p>
         <p>Click on each file to expand its refactoring suggestions.</p>
     </div>
 """
 
-HTML_TOC_START = """
+# Stylesheet written next to the report as report.css
+REPORT_CSS = """\
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
+    line-height: 1.6;
+    color: #333;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
+.file-section {
+    margin-bottom: 20px;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+    overflow: hidden;
+}
+.file-header {
+    background-color: #f5f5f5;
+    padding: 10px 15px;
+    cursor: pointer;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+.file-header:hover {
+    background-color: #e9e9e9;
+}
+.file-name {
+    font-weight: bold;
+    font-family: monospace;
+}
+.file-content {
+    padding: 15px;
+    border-top: 1px solid #ddd;
+    display: none;
+}
+.toggle-button {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    padding: 5px 10px;
+    text-align: center;
+    text-decoration: none;
+    display: inline-block;
+    font-size: 14px;
+    border-radius: 4px;
+    cursor: pointer;
+}
+.toggle-button:hover {
+    background-color: #45a049;
+}
+pre {
+    background: #f8f8f8;
+    padding: 10px;
+    overflow-x: auto;
+    border-radius: 4px;
+    border: 1px solid #ddd;
+}
+h1, h2, h3 {
+    margin: 0.5em 0;
+}
+.summary {
+    margin-bottom: 20px;
+    padding: 15px;
+    background-color: #f0f8ff;
+    border-radius: 4px;
+    border: 1px solid #b8daff;
+}
+.toc {
+    margin-bottom: 20px;
+    padding: 15px;
+    background-color: #f5f5f5;
+    border-radius: 4px;
+    border: 1px solid #ddd;
+}
+.toc ul {
+    list-style-type: none;
+    padding-left: 10px;
+}
+.toc li {
+    margin-bottom: 5px;
+}
+.toc a {
+    text-decoration: none;
+    color: #0366d6;
+}
+.toc a:hover {
+    text-decoration: underline;
+}
+.severity-high {
+    color: #d73a49;
+    font-weight: bold;
+}
+.severity-medium {
+    color: #e36209;
+    font-weight: bold;
+}
+.severity-low {
+    color: #0366d6;
+    font-weight: bold;
+}
+"""
+
+# Filled in by report.js, since sections are written in the order their analyses complete
+HTML_TOC = """
     <div class="toc">
         <h2>Table of Contents</h2>
-        <ul>
+        <ul id="toc"></ul>
+    </div>
 """
 
-HTML_TOC_END = """
-        </ul>
+HTML_TOGGLE_ALL = """    <div style="margin-bottom: 20px">
+        <button onclick="expandAll()" class="toggle-button">Expand All</button>
+        <button onclick="collapseAll()" class="toggle-button" style="margin-left: 10px">Collapse All</button>
     </div>
 """
 
-HTML_FOOTER = """
-    <script>
-        function toggleSection(index) {
-            const content = document.getElementById(`file-content-${index}`);
-            const button = document.querySelector(`#file-header-${index} .toggle-button`);
-            
-            if (content.style.display === 'block') {
-                content.style.display = 'none';
-                button.textContent = 'Show';
-            } else {
-                content.style.display = 'block';
-                button.textContent = 'Hide';
-            }
-        }
-        
-        // Function to expand all sections
-        function expandAll() {
-            document.querySelectorAll('.file-content').forEach((content, index) => {
-                content.style.display = 'block';
-                document.querySelector(`#file-header-${index} .toggle-button`).textContent = 'Hide';
-            });
-        }
-        
-        // Function to collapse all sections
-        function collapseAll() {
-            document.querySelectorAll('.file-content').forEach((content, index) => {
-                content.style.display = 'none';
-                document.querySelector(`#file-header-${index} .toggle-button`).textContent = 'Show';
-            });
-        }
-    </script>
+HTML_SECTIONS = """    <div id="sections"></div>
+"""
+
+# The analyses are embedded as JSON lines and rendered by report.js, so the
+# report still works when opened straight from disk
+# JSON escapes for the characters that could affect how the HTML parser reads
+# the embedded data; these only ever occur inside JSON strings
+SCRIPT_SAFE_JSON = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026'})
+
+HTML_DATA_START = """    <script id="report-data" type="application/x-ndjson">
+"""
+
+HTML_FOOTER = f"""    </script>
+    <script src="{MARKED_URL}"></script>
+    <script src="{DOMPURIFY_URL}"></script>
+    <script src="report.js"></script>
 </body>
 </html>
 """
 
+# Script written next to the report as report.js
+REPORT_JS = """\
+function toggleSection(index) {
+    const content = document.getElementById(`file-content-${index}`);
+    const button = document.querySelector(`#file-header-${index} .toggle-button`);
+    
+    if (content.style.display === 'block') {
+        content.style.display = 'none';
+        button.textContent = 'Show';
+    } else {
+        content.style.display = 'block';
+        button.textContent = 'Hide';
+    }
+}
+
+// Show or hide every section
+function setAllSections(display, label) {
+    document.querySelectorAll('.file-section').forEach(section => {
+        section.querySelector('.file-content').style.display = display;
+        section.querySelector('.toggle-button').textContent = label;
+    });
+}
+
+// Function to expand all sections
+function expandAll() {
+    setAllSections('block', 'Hide');
+}
+
+// Function to collapse all sections
+function collapseAll() {
+    setAllSections('none', 'Show');
+}
+
+function escapeHtml(text) {
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+// Render the Markdown from GPT (as plain text if marked.js or DOMPurify could
+// not be loaded) and highlight severity levels. Raw HTML in the Markdown is
+// shown as text, and DOMPurify strips anything unsafe that is left, such as
+// javascript: links.
+function renderAnalysis(analysis) {
+    let html;
+    if (window.marked && window.DOMPurify) {
+        const renderer = new marked.Renderer();
+        renderer.html = escapeHtml;
+        html = DOMPurify.sanitize(marked.parse(analysis, { renderer }));
+    } else {
+        html = `<pre>${escapeHtml(analysis)}</pre>`;
+    }
+    return html.replace(/Severity: (High|Medium|Low)/g,
+        (match, level) => `<span class="severity-${level.toLowerCase()}">${match}</span>`);
+}
+
+function renderSection(record) {
+    const section = document.createElement('div');
+    section.className = 'file-section';
+    section.id = `file-${record.index}`;
+
+    const header = document.createElement('div');
+    header.className = 'file-header';
+    header.id = `file-header-${record.index}`;
+    header.onclick = () => toggleSection(record.index);
+    const name = document.createElement('span');
+    name.className = 'file-name';
+    name.textContent = record.path;
+    const button = document.createElement('button');
+    button.className = 'toggle-button';
+    button.type = 'button';
+    button.textContent = 'Show';
+    header.append(name, button);
+
+    const content = document.createElement('div');
+    content.className = 'file-content';
+    content.id = `file-content-${record.index}`;
+    content.innerHTML = renderAnalysis(record.analysis);
+
+    section.append(header, content);
+    return section;
+}
+
+// Build the sections and table of contents in file order
+document.addEventListener('DOMContentLoaded', () => {
+    const container = document.getElementById('sections');
+    const toc = document.getElementById('toc');
+    document.getElementById('report-data').textContent
+        .split('\\n')
+        .filter(line => line.trim())
+        .map(line => JSON.parse(line))
+        .sort((a, b) => a.index - b.index)
+        .forEach(record => {
+            container.appendChild(renderSection(record));
+            const link = document.createElement('a');
+            link.href = `#file-${record.index}`;
+            link.textContent = record.path;
+            const item = document.createElement('li');
+            item.appendChild(link);
+            toc.appendChild(item);
+        });
+});
+"""
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests per minute and tokens per minute"""
+
+    def __init__(self, max_requests_per_minute, max_tokens_per_minute):
+        self.max_requests = max_requests_per_minute
+        self.max_tokens = max_tokens_per_minute
+        self.available_requests = float(max_requests_per_minute)
+        self.available_tokens = float(max_tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        """Top up both buckets in proportion to the time elapsed since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.available_requests = min(self.max_requests, self.available_requests + elapsed * self.max_requests / 60)
+        self.available_tokens = min(self.max_tokens, self.available_tokens + elapsed * self.max_tokens / 60)
+
+    async def acquire(self, tokens):
+        """Wait until one request and the given number of tokens are available"""
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                
+                wait_requests = (1 - self.available_requests) * 60 / self.max_requests
+                wait_tokens = (tokens - self.available_tokens) * 60 / self.max_tokens
+                await asyncio.sleep(max(wait_requests, wait_tokens))
+
 
 def setup_openai_client():
-    """Configure the OpenAI client with API key from environment variables"""
+    """Configure the async OpenAI client with API key from environment variables"""
     api_key = os.environ.get('OPENAI_API_KEY')
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is not set")
     
-    return openai.OpenAI(api_key=api_key)
+    # Retries are handled by request_analysis so they can back off with jitter
+    return openai.AsyncOpenAI(api_key=api_key, max_retries=0)
 
 
 def find_python_files():
     """Find all Python files in the repository"""
-    # Exclude virtual environments, .git directory, and other non-source directories
-    exclude_patterns = [
-        '.git/**',
-        'venv/**',
-        '.venv/**',
-        '__pycache__/**',
-        '*.pyc',
-        '*.pyo',
-        '*.pyd',
-        '.github/**',  # Skip GitHub workflows and scripts
-    ]
-    
-    # Find all Python files
-    python_files = glob.glob('**/*.py', recursive=True)
+    python_files = []
     
-    # Filter out excluded files
-    for pattern in exclude_patterns:
-        python_files = [f for f in python_files if not Path(f).match(pattern)]
+    # Depth-first scan that never enters excluded or hidden directories (e.g. .git, .github).
+    # Paths are built by string concatenation from a prefix that already ends in a separator.
+    pending = ['']
+    while pending:
+        prefix = pending.pop()
+        try:
+            with os.scandir(prefix or '.') as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot scan {prefix or '.'}: {e}")
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if name not in EXCLUDE_DIRS:
+                    subdirs.append(prefix + name + os.sep)
+            elif name.endswith('.py'):
+                python_files.append(prefix + name)
+        
+        # Reverse so subdirectories are visited in sorted order
+        pending.extend(reversed(subdirs))
     
     logger.info(f"Found {len(python_files)} Python files to analyze")
     return python_files
 
 
-def analyze_file(client, file_path):
-    """Analyze a single Python file for refactoring opportunities"""
-    logger.info(f"Analyzing {file_path}...")
+@functools.lru_cache(maxsize=None)
+def get_token_encoding():
+    """Return the tiktoken encoding for MODEL, or None if tiktoken is unavailable"""
+    if not has_tiktoken:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(MODEL)
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding, estimating token counts instead: {e}")
+        return None
+
+
+def estimate_tokens(text):
+    """Count the tokens in a piece of text, or estimate them (~4 characters per token) without tiktoken"""
+    encoding = get_token_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_code(code_content, max_tokens):
+    """
+    Split Python code into chunks that each fit within a token budget
     
-    # Read file content
+    Chunks are made of whole top-level statements (functions, classes, ...)
+    where possible; a single statement that is too large on its own is split
+    by lines.
+    
+    Args:
+        code_content: Python source code
+        max_tokens: Token budget for each chunk
+        
+    Returns:
+        list: List of (first_line, last_line, chunk_text) tuples, 1-based
+    """
+    lines = code_content.splitlines(keepends=True)
+    
+    # Start a new segment at each top-level statement, including its decorators
     try:
+        tree = ast.parse(code_content)
+        starts = {
+            min([node.lineno] + [decorator.lineno for decorator in getattr(node, 'decorator_list', [])]) - 1
+            for node in tree.body
+        }
+    except SyntaxError:
+        starts = set()
+    starts = sorted(starts | {0})
+    segments = [lines[start:end] for start, end in zip(starts, starts[1:] + [len(lines)])]
+    
+    # Break up any segment that is too large on its own
+    pieces = []
+    for segment in segments:
+        if estimate_tokens(''.join(segment)) <= max_tokens:
+            pieces.append(segment)
+            continue
+        piece = []
+        for line in segment:
+            if piece and estimate_tokens(''.join(piece) + line) > max_tokens:
+                pieces.append(piece)
+                piece = []
+            piece.append(line)
+        if piece:
+            pieces.append(piece)
+    
+    # Greedily merge neighbouring pieces up to the budget
+    chunks = []
+    current, first_line, line_number = [], 1, 1
+    for piece in pieces:
+        if current and estimate_tokens(''.join(current + piece)) > max_tokens:
+            chunks.append((first_line, line_number - 1, ''.join(current)))
+            current, first_line = [], line_number
+        current.extend(piece)
+        line_number += len(piece)
+    if current:
+        chunks.append((first_line, line_number - 1, ''.join(current)))
+    
+    return chunks
+
+
+def cache_key(code_content):
+    """Build the cache key for a file's analysis from the model, prompt and content"""
+    digest = hashlib.sha256()
+    for part in (MODEL, SYSTEM_PROMPT, USER_PROMPT_PREFIX, code_content):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def read_cached_analysis(key, ignore_ttl=False):
+    """Return the cached analysis for a key, or None if missing or older than CACHE_TTL"""
+    cache_path = os.path.join(CACHE_DIR, f"{key}.md")
+    try:
+        if not ignore_ttl and time.time() - os.path.getmtime(cache_path) > CACHE_TTL:
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_cached_analysis(key, analysis):
+    """Atomically store an analysis in the cache"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(analysis)
+        os.replace(tmp_path, os.path.join(CACHE_DIR, f"{key}.md"))
+    except OSError as e:
+        logger.warning(f"Could not cache analysis: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_file(file_path):
+    """Read a Python file, returning None if it cannot be read or should be skipped"""
+    try:
+        # Skip files that are too large before reading any of their content
+        size = os.path.getsize(file_path)
+        if size > MAX_FILE_SIZE:
+            logger.warning(f"Skipping {file_path} - too large ({size} bytes)")
+            return None
+        
+        # Never read more than the limit, in case the file grew since it was sized
         with open(file_path, 'r', encoding='utf-8') as f:
-            code_content = f.read()
+            code_content = f.read(MAX_FILE_SIZE + 1)
     except Exception as e:
         logger.error(f"Error reading {file_path}: {e}")
         return None
     
-    # Skip files that are too large
     if len(code_content) > MAX_FILE_SIZE:
-        logger.warning(f"Skipping {file_path} - too large ({len(code_content)} bytes)")
+        logger.warning(f"Skipping {file_path} - too large (over {MAX_FILE_SIZE} characters)")
         return None
     
     # Skip empty files
@@ -249,106 +582,441 @@ def analyze_file(client, file_path):
         logger.warning(f"Skipping {file_path} - empty file")
         return None
     
-    # Call OpenAI API
+    return code_content
+
+
+def load_files(file_paths):
+    """Read and validate all files concurrently, returning contents in input order"""
+    with ThreadPoolExecutor(max_workers=FILE_READ_WORKERS) as pool:
+        return list(pool.map(load_file, file_paths))
+
+
+@retry(
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    reraise=True
+)
+async def request_analysis(client, user_content, max_tokens, rate_limiter=None, batch=False):
+    """
+    Send one analysis request to the OpenAI API and return the streamed response text
+    
+    Rate limits, connection problems and server errors are retried with
+    exponential backoff; anything else (e.g. a BadRequestError for an
+    oversized prompt) is raised immediately. Batched requests use
+    BATCH_SYSTEM_PROMPT and ask the API for a JSON object.
+    """
+    # Respect the per-minute request and token budgets
+    if rate_limiter:
+        await rate_limiter.acquire(estimate_tokens(user_content) + max_tokens)
+    
+    options = {'response_format': {"type": "json_object"}} if batch else {}
+    stream = await client.chat.completions.create(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT if batch else SYSTEM_PROMPT},
+            {"role": "user", "content": user_content}
+        ],
+        temperature=0.1,
+        max_tokens=max_tokens,
+        prompt_cache_key=PROMPT_CACHE_KEY,
+        stream=True,
+        **options
+    )
+    
+    # Collect the response as it is generated
+    parts = []
+    async for chunk in stream:
+        if chunk.choices:
+            parts.append(chunk.choices[0].delta.content or "")
+    return ''.join(parts)
+
+
+def load_manifest():
+    """Load the manifest of path -> cache key from the previous run"""
     try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": """You are a code refactoring expert familiar with Martin Fowler's Refactoring catalog. 
-                Analyze Python code to identify refactoring opportunities. For each opportunity:
-                1. Identify the specific refactoring pattern from Fowler's catalog
-                2. Specify the function name and line numbers
-                3. Explain the code smell that indicates the need for refactoring
-                4. Provide a clear recommendation with specific next steps
-                5. Include a link to the refactoring pattern documentation
-                6. Assign a severity level (High, Medium, Low) based on impact
-                
-                Format your response as Markdown with clear headings and bullet points.
-                """},
-                {"role": "user", "content": f"Analyze this Python code and identify refactoring opportunities using Martin Fowler's catalog:\n\n```python\n{code_content}\n```"}
-            ],
-            temperature=0.1,
-            max_tokens=1500
-        )
-        
-        # Extract and return results
-        return response.choices[0].message.content
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(manifest):
+    """Atomically write the manifest of path -> cache key for the next run"""
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(MANIFEST_PATH), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError as e:
+        logger.warning(f"Could not save manifest: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+async def analyze_in_chunks(client, file_path, code_content, rate_limiter=None, semaphore=None):
+    """
+    Analyze a file that is too large for one request as a series of chunks
+    
+    The chunks are requested together, but each request takes its own slot in
+    the semaphore so a large file can't exceed the concurrency limit.
+    """
+    overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(USER_PROMPT_PREFIX) + CHUNK_PROMPT_TOKENS
+    chunks = split_code(code_content, MAX_INPUT_TOKENS - overhead)
+    logger.info(f"Splitting {file_path} into {len(chunks)} chunks")
+    
+    requests = [
+        bounded(semaphore, request_analysis(
+            client,
+            f"{USER_PROMPT_PREFIX}This is lines {first_line}-{last_line} of {file_path}; "
+            f"report line numbers for the whole file.\n\n```python\n{chunk}\n```",
+            MAX_RESPONSE_TOKENS,
+            rate_limiter
+        ))
+        for first_line, last_line, chunk in chunks
+    ]
+    analyses = await asyncio.gather(*requests)
+    
+    return '\n\n'.join(
+        f"## Lines {first_line}-{last_line}\n\n{analysis}"
+        for (first_line, last_line, _), analysis in zip(chunks, analyses)
+        if analysis
+    ) or None
+
+
+async def analyze_code(client, file_path, code_content, rate_limiter=None, use_cache=True, semaphore=None):
+    """Analyze the content of a single Python file for refactoring opportunities"""
+    # Reuse a previous analysis of identical content
+    key = cache_key(code_content)
+    if use_cache:
+        cached = read_cached_analysis(key)
+        if cached is not None:
+            logger.info(f"Using cached analysis for {file_path}")
+            return cached
+    
+    logger.info(f"Analyzing {file_path}...")
+    user_content = f"{USER_PROMPT_PREFIX}```python\n{code_content}\n```"
+    try:
+        if estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(user_content) > MAX_INPUT_TOKENS:
+            analysis = await analyze_in_chunks(client, file_path, code_content, rate_limiter, semaphore)
+        else:
+            analysis = await bounded(semaphore, request_analysis(client, user_content, MAX_RESPONSE_TOKENS, rate_limiter))
     except Exception as e:
         logger.error(f"Error analyzing {file_path}: {e}")
         return None
+    
+    if analysis:
+        write_cached_analysis(key, analysis)
+    return analysis
 
 
-def generate_html_report(file_paths, analyses):
-    """Generate a single HTML report with collapsible sections for each file"""
-    logger.info(f"Generating HTML report: {OUTPUT_HTML}")
-    
-    # Create output directory if it doesn't exist
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+async def analyze_file(client, file_path, rate_limiter=None, use_cache=True):
+    """Analyze a single Python file for refactoring opportunities"""
+    code_content = load_file(file_path)
+    if code_content is None:
+        return None
+    return await analyze_code(client, file_path, code_content, rate_limiter, use_cache)
+
+
+def pack_batches(files):
+    """
+    Group small files into batches that can share a single request
     
-    # Filter out files with no analysis
-    valid_analyses = [(path, analysis) for path, analysis in zip(file_paths, analyses) if analysis]
+    Files are packed greedily in order of size; any file larger than
+    BATCH_FILE_SIZE gets a batch of its own.
     
-    with open(OUTPUT_HTML, 'w', encoding='utf-8') as report:
-        # Write HTML header
-        report.write(HTML_HEADER)
+    Args:
+        files: List of (path, code_content) tuples
         
-        # Generate table of contents
-        report.write(HTML_TOC_START)
-        for i, (path, _) in enumerate(valid_analyses):
-            report.write(f'            <li><a href="#file-{i}">{path}</a></li>\n')
-        report.write(HTML_TOC_END)
+    Returns:
+        list: List of batches, each a list of (path, code_content) tuples
+    """
+    batches = []
+    current, current_size = [], 0
+    
+    for path, code_content in sorted(files, key=lambda item: len(item[1])):
+        size = len(code_content)
+        if size > BATCH_FILE_SIZE:
+            batches.append([(path, code_content)])
+            continue
         
-        # Add expand/collapse all buttons
-        report.write('    <div style="margin-bottom: 20px">\n')
-        report.write('        <button onclick="expandAll()" class="toggle-button">Expand All</button>\n')
-        report.write('        <button onclick="collapseAll()" class="toggle-button" style="margin-left: 10px">Collapse All</button>\n')
-        report.write('    </div>\n')
+        if current and (current_size + size > BATCH_MAX_SIZE or len(current) >= BATCH_MAX_FILES):
+            batches.append(current)
+            current, current_size = [], 0
+        current.append((path, code_content))
+        current_size += size
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text, paths):
+    """Parse a batched JSON response into a dict of path -> analysis, or None if unusable"""
+    if not text:
+        return None
+    
+    # Tolerate a Markdown code fence around the JSON object
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end == -1:
+        return None
+    
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    
+    return {path: parsed[path] for path in paths if isinstance(parsed.get(path), str) and parsed[path].strip()}
+
+
+async def analyze_files_batched(client, batch, rate_limiter=None, semaphore=None):
+    """
+    Analyze several small files with a single request
+    
+    Files missing from the response (or all of them, if the response cannot
+    be parsed) are analyzed individually instead.
+    
+    Args:
+        client: Async OpenAI client
+        batch: List of (path, code_content) tuples
+        rate_limiter: Optional RateLimiter shared by all requests
+        semaphore: Optional semaphore bounding the number of requests in flight
         
-        # Write each file's analysis
-        for i, (path, analysis) in enumerate(valid_analyses):
-            report.write(f'    <div class="file-section" id="file-{i}">\n')
-            report.write(f'        <div class="file-header" id="file-header-{i}" onclick="toggleSection({i})">\n')
-            report.write(f'            <span class="file-name">{path}</span>\n')
-            report.write(f'            <button class="toggle-button" type="button">Show</button>\n')
-            report.write('        </div>\n')
-            report.write(f'        <div class="file-content" id="file-content-{i}">\n')
-            
-            # Convert the Markdown from GPT into HTML-safe content
-            safe_analysis = analysis.replace('<', '&lt;').replace('>', '&gt;')
-            
-            # Add some basic styling for severity levels
-            safe_analysis = safe_analysis.replace('Severity: High', '<span class="severity-high">Severity: High</span>')
-            safe_analysis = safe_analysis.replace('Severity: Medium', '<span class="severity-medium">Severity: Medium</span>')
-            safe_analysis = safe_analysis.replace('Severity: Low', '<span class="severity-low">Severity: Low</span>')
-            
-            report.write(f'            <pre>{safe_analysis}</pre>\n')
-            report.write('        </div>\n')
-            report.write('    </div>\n')
+    Returns:
+        dict: Mapping of path -> analysis
+    """
+    if len(batch) == 1:
+        path, code_content = batch[0]
+        return {path: await analyze_code(client, path, code_content, rate_limiter, use_cache=False, semaphore=semaphore)}
+    
+    paths = [path for path, _ in batch]
+    logger.info(f"Analyzing batch of {len(batch)} files: {', '.join(paths)}")
+    
+    sections = ''.join(f"\n### {path}\n```python\n{code_content}\n```\n" for path, code_content in batch)
+    user_content = f"{BATCH_PROMPT_PREFIX}{sections}"
+    
+    try:
+        # Each file gets the same response budget it would have on its own
+        text = await bounded(semaphore, request_analysis(
+            client, user_content, MAX_RESPONSE_TOKENS * len(batch), rate_limiter, batch=True
+        ))
+        analyses = parse_batch_response(text, paths)
+    except Exception as e:
+        logger.warning(f"Batched analysis failed: {e}")
+        analyses = None
+    
+    if analyses is None:
+        logger.warning("Could not parse batched analysis, falling back to single-file requests")
+        analyses = {}
+    
+    for path, code_content in batch:
+        if path in analyses:
+            write_cached_analysis(cache_key(code_content), analyses[path])
+        else:
+            analyses[path] = await analyze_code(client, path, code_content, rate_limiter, use_cache=False, semaphore=semaphore)
+    return analyses
+
+
+async def bounded(semaphore, coro):
+    """Await a coroutine while holding the given semaphore, if there is one"""
+    if semaphore is None:
+        return await coro
+    async with semaphore:
+        return await coro
+
+
+async def iter_analyses(client, file_paths, use_cache=True, manifest=None):
+    """
+    Analyze all files concurrently, bounded by the concurrency and rate limits
+    
+    Args:
+        client: Async OpenAI client
+        file_paths: Paths of the files to analyze
+        use_cache: Whether cached analyses may be reused
+        manifest: Optional dict of path -> cache key from the previous run. Files
+            whose content is unchanged reuse their cached analysis regardless of
+            CACHE_TTL. The dict is updated in place once all files are analyzed.
         
-        # Write HTML footer
-        report.write(HTML_FOOTER)
+    Yields:
+        tuple: (path, analysis) for each analyzed file, in the order the analyses complete
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    rate_limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+    previous = dict(manifest or {})
+    
+    # Files with identical content share a single analysis
+    groups = {}
+    contents = {}
+    for path, code_content in zip(file_paths, load_files(file_paths)):
+        if code_content is None:
+            continue
+        key = cache_key(code_content)
+        if key not in groups:
+            groups[key] = []
+            contents[key] = code_content
+        groups[key].append(path)
+    
+    # Collect cached analyses and the files that still need a request
+    cached_analyses = []
+    pending = []
+    for key, paths in groups.items():
+        cached = None
+        if use_cache:
+            unchanged = any(previous.get(path) == key for path in paths)
+            cached = read_cached_analysis(key, ignore_ttl=unchanged)
+        if cached is not None:
+            logger.info(f"Using cached analysis for {paths[0]}")
+            cached_analyses.append((key, cached))
+        else:
+            pending.append((paths[0], contents[key]))
+    representative_keys = {paths[0]: key for key, paths in groups.items()}
+    
+    async def run_batch(batch):
+        # A failed analysis should not take the rest of the report down with it
+        try:
+            # The semaphore is taken per request, so a batch that falls back to
+            # single-file or chunked requests still stays within the limit
+            return await analyze_files_batched(client, batch, rate_limiter, semaphore)
+        except Exception as e:
+            for path, _ in batch:
+                logger.error(f"Error analyzing {path}: {e}")
+            return {}
+    
+    # Start the requests before handing out cached results
+    tasks = [asyncio.ensure_future(run_batch(batch)) for batch in pack_batches(pending)]
+    
+    analyzed = {}
+    for key, analysis in cached_analyses:
+        for path in groups[key]:
+            analyzed[path] = key
+            yield path, analysis
+    
+    for task in asyncio.as_completed(tasks):
+        for representative, analysis in (await task).items():
+            key = representative_keys[representative]
+            for path in groups[key]:
+                if analysis:
+                    analyzed[path] = key
+                yield path, analysis
+    
+    if manifest is not None:
+        manifest.clear()
+        manifest.update({path: analyzed[path] for path in file_paths if path in analyzed})
+
+
+async def analyze_files(client, file_paths, use_cache=True, manifest=None):
+    """
+    Analyze all files concurrently and collect the results
+    
+    Returns:
+        list: Analysis for each path (None where the file was skipped or failed)
+    """
+    analyses = {}
+    async for path, analysis in iter_analyses(client, file_paths, use_cache, manifest):
+        analyses[path] = analysis
+    
+    return [analyses.get(path) for path in file_paths]
+
+
+def write_asset(path, content):
+    """Write a static report asset unless the file already has the same content"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    except OSError:
+        pass
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def write_report_assets():
+    """Create the output directory and the stylesheet and script shared by reports"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    write_asset(OUTPUT_CSS, REPORT_CSS)
+    write_asset(OUTPUT_JS, REPORT_JS)
+
+
+def write_header(report):
+    """Write everything in the report that comes before the embedded analyses"""
+    report.write(HTML_HEADER + HTML_TOC + HTML_TOGGLE_ALL + HTML_SECTIONS + HTML_DATA_START)
+
+
+def write_section(report, data, index, path, analysis):
+    """Write one file's analysis as a line of JSON to the data file and the report"""
+    record = json.dumps({'index': index, 'path': path, 'analysis': analysis}) + '\n'
+    data.write(record)
+    # Keep markup such as "</script>" or "<!--" inside an analysis from ending
+    # or changing the parsing of the embedded data
+    report.write(record.translate(SCRIPT_SAFE_JSON))
+
+
+def write_footer(report):
+    """Write everything in the report that comes after the embedded analyses"""
+    report.write(HTML_FOOTER)
+
+
+def generate_html_report(file_paths, analyses):
+    """Generate a single HTML report with collapsible sections for each file"""
+    logger.info(f"Generating HTML report: {OUTPUT_HTML}")
+    write_report_assets()
+    
+    with open(OUTPUT_HTML, 'w', encoding='utf-8') as report, open(OUTPUT_JSONL, 'w', encoding='utf-8') as data:
+        write_header(report)
+        for index, (path, analysis) in enumerate(zip(file_paths, analyses)):
+            # Skip files with no analysis
+            if analysis:
+                write_section(report, data, index, path, analysis)
+        write_footer(report)
     
     logger.info(f"HTML report generated at {OUTPUT_HTML}")
     return OUTPUT_HTML
 
 
-def main():
+async def stream_html_report(client, file_paths, use_cache=True, manifest=None):
+    """Analyze the files and write each one's section to the report as soon as it completes"""
+    logger.info(f"Generating HTML report: {OUTPUT_HTML}")
+    write_report_assets()
+    indexes = {path: index for index, path in enumerate(file_paths)}
+    
+    with open(OUTPUT_HTML, 'w', encoding='utf-8') as report, open(OUTPUT_JSONL, 'w', encoding='utf-8') as data:
+        write_header(report)
+        async for path, analysis in iter_analyses(client, file_paths, use_cache, manifest):
+            if analysis:
+                write_section(report, data, indexes[path], path, analysis)
+        write_footer(report)
+    
+    logger.info(f"HTML report generated at {OUTPUT_HTML}")
+    return OUTPUT_HTML
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Analyze Python files for refactoring opportunities')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached analyses and call the API for every file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function to orchestrate the analysis process"""
+    args = parse_args(argv)
+    
     # Setup OpenAI client
     client = setup_openai_client()
     
     # Find Python files
     python_files = find_python_files()
     
-    # Analyze each file
-    results = []
-    
-    for file_path in python_files:
-        result = analyze_file(client, file_path)
-        results.append(result)
-    
-    # Generate HTML report
-    generate_html_report(python_files, results)
+    # Analyze the files concurrently, skipping files unchanged since the last run,
+    # and write each file's section of the HTML report as soon as it is ready
+    manifest = {} if args.no_cache else load_manifest()
+    asyncio.run(stream_html_report(client, python_files, use_cache=not args.no_cache, manifest=manifest))
+    save_manifest(manifest)
     
     logger.info(f"Analysis complete. Report saved to {OUTPUT_HTML}")
 
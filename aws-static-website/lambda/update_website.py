@@ -7,18 +7,142 @@ Ovechkin stats data, similar to what is sent in the email notifications.
 """
 
 import os
+import re
 import logging
-import pytz
-import subprocess
-import json
+import functools
+import hashlib
+import importlib
+import time
 from datetime import datetime
+from types import MappingProxyType
 import sys
-import shutil
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Get the directory of this script and the project root above it
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Import OvechkinData once per process so warm Lambda invocations reuse it,
+# adding the project root to the path if the package is there
+if PROJECT_ROOT not in sys.path and os.path.exists(os.path.join(PROJECT_ROOT, 'ovechkin_tracker')):
+    sys.path.insert(0, PROJECT_ROOT)
+try:
+    from ovechkin_tracker.ovechkin_data import OvechkinData
+except ImportError as e:
+    logger.warning(f"Direct import of OvechkinData failed: {str(e)}")
+    OvechkinData = None
+
+# Shared read-only stand-in for missing sections of the stats
+EMPTY_MAPPING = MappingProxyType({})
+
+# Sidecar file, next to the static directory so it is never uploaded, recording
+# which page index.html was last written with. It is shared with celebrate.py,
+# and it also records index.html's stat so a page written by anything else
+# never matches.
+PAGE_SIGNATURE_NAME = 'index.html.sig'
+
+# Rewrite the page at least this often (in seconds), so that its "Last updated"
+# time never falls too far behind even when the stats haven't changed
+MAX_PAGE_AGE = 3600
+
+# Resolve the Eastern timezone once, using the standard library's zoneinfo and
+# falling back to pytz where zoneinfo's timezone data is not available
+try:
+    from zoneinfo import ZoneInfo
+    EASTERN_TZ = ZoneInfo('America/New_York')
+except Exception:
+    import pytz
+    EASTERN_TZ = pytz.timezone('America/New_York')
+
+# Date and time formats found in the projected game data
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+GAME_DATE_PATTERN = re.compile(r'(\w+), (\d{4})-(\d{2})-(\d{2})(?:, .*)?', re.DOTALL)
+GAME_TIME_PATTERN = re.compile(r'(\d{1,2}:\d{2}\s*(?:AM|PM)\s*ET)')
+YMD_DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+MDY_DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+# English month and weekday names, indexed by date.month and date.weekday()
+MONTH_NAMES = ('', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December')
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Marks where the update time goes in a cached page
+CURRENT_TIME_PLACEHOLDER = '<!--current-time-->'
+
+
+def parse_date(text, pattern, year_group, month_group, day_group):
+    """
+    Parse a date by matching its digits directly rather than through strptime
+    
+    Args:
+        text: Date string to parse
+        pattern: Compiled pattern that must match the whole string
+        year_group, month_group, day_group: Pattern groups holding each field
+        
+    Returns:
+        datetime: The parsed date, or None if text isn't a valid date
+    """
+    match = pattern.fullmatch(text)
+    if not match:
+        return None
+    try:
+        return datetime(int(match.group(year_group)), int(match.group(month_group)), int(match.group(day_group)))
+    except ValueError:
+        return None
+
+
+def parse_ymd_date(text):
+    """Parse a YYYY-MM-DD date, returning None if it isn't one"""
+    return parse_date(text, YMD_DATE_PATTERN, 1, 2, 3)
+
+
+def parse_mdy_date(text):
+    """Parse an MM/DD/YYYY date, returning None if it isn't one"""
+    return parse_date(text, MDY_DATE_PATTERN, 3, 1, 2)
+
+
+def format_month_day_year(date_obj):
+    """Format a date as "April 12, 2025" without going through strftime"""
+    return f"{MONTH_NAMES[date_obj.month]} {date_obj.day:02d}, {date_obj.year}"
+
+
+def format_full_date(date_obj):
+    """Format a date as "Saturday, April 12, 2025" without going through strftime"""
+    return f"{DAY_NAMES[date_obj.weekday()]}, {format_month_day_year(date_obj)}"
+
+
+def format_game_date(date_str):
+    """
+    Clean up the 'date' field of the projected game
+    
+    Args:
+        date_str: Date such as "Saturday, 2025-04-12 (12/04/2025)"
+        
+    Returns:
+        str: The date as "Saturday, April 12, 2025" where it can be parsed,
+        otherwise the date without its parenthesized part
+    """
+    if not date_str:
+        return ''
+    
+    # Dates without a European format in parentheses are used as they are
+    if '(' not in date_str:
+        return date_str
+    
+    parts = date_str.partition('(')[0].strip()
+    # If it's "Weekday, YYYY-MM-DD", convert it, keeping the day of the week
+    match = GAME_DATE_PATTERN.fullmatch(parts)
+    if match:
+        try:
+            date_obj = datetime(int(match.group(2)), int(match.group(3)), int(match.group(4)))
+            return f"{match.group(1)}, {format_month_day_year(date_obj)}"
+        except ValueError:
+            pass
+    return parts
+
 
 def generate_html_content(stats):
     """
@@ -30,139 +154,163 @@ def generate_html_content(stats):
     Returns:
         str: HTML content for the website
     """
-    # Import required modules
-    from datetime import datetime
-    import re
-    
-    # Extract key information
-    total_goals = stats.get('flat_stats', {}).get('Total Number of Goals', 'N/A')
-    goals_needed = stats.get('flat_stats', {}).get('Goals to Beat Gretzy', 'N/A')
+    return render_page(get_page_fields(stats))
+
+
+@functools.lru_cache(maxsize=128)
+def format_projected_date(raw_date, date_str):
+    """
+    Format the date of the projected game. The same game is projected for many
+    updates in a row, so results are cached.
     
-    # Get the projected game dictionary from nested stats which has structured data
-    projected_game_dict = stats.get('nested_stats', {}).get('record', {}).get('projected_game', {})
+    Args:
+        raw_date: The game's 'raw_date' field, normally YYYY-MM-DD
+        date_str: The game's 'date' field, used if raw_date can't be parsed
+        
+    Returns:
+        str: The date, as "Saturday, April 12, 2025" where it can be parsed
+    """
+    # If we have a raw date in YYYY-MM-DD format, convert it to "Saturday, April 12, 2025" format
+    if raw_date and ISO_DATE_PATTERN.match(raw_date):
+        date_obj = parse_ymd_date(raw_date)
+        if date_obj:
+            return format_full_date(date_obj)
     
-    # Format the projection string exactly as requested: "Saturday, April 12, 2025, 12:30 PM ET vs Columbus Blue Jackets (Away)"
-    formatted_projection = "Record-Breaking Game: "
+    # If there's no usable raw date, use the 'date' field
+    return format_game_date(date_str)
+
+
+def format_game_projection(projected_game_dict):
+    """
+    Describe the projected record-breaking game from its structured data
     
-    # Extract and format the date properly
-    if projected_game_dict:
-        # Try to get the raw date from the dictionary and convert it to the proper format
-        raw_date = projected_game_dict.get('raw_date', '')
-        day_of_week = ''
-        
-        # If we have a raw date in YYYY-MM-DD format, convert it to "Saturday, April 12, 2025" format
-        if raw_date and re.match(r'\d{4}-\d{2}-\d{2}', raw_date):
-            try:
-                date_obj = datetime.strptime(raw_date, '%Y-%m-%d')
-                formatted_date = date_obj.strftime('%A, %B %d, %Y')
-                formatted_projection += formatted_date
-            except Exception:
-                # If date parsing fails, try to use the 'date' field directly
-                date_str = projected_game_dict.get('date', '')
-                if date_str:
-                    # Try to clean up the date string if it has European format in parentheses
-                    if '(' in date_str:
-                        parts = date_str.split('(')[0].strip()
-                        # If it's in YYYY-MM-DD format, convert it
-                        if re.match(r'\w+, \d{4}-\d{2}-\d{2}', parts):
-                            try:
-                                # Extract just the date part
-                                date_part = parts.split(', ')[1]
-                                date_obj = datetime.strptime(date_part, '%Y-%m-%d')
-                                day_of_week = parts.split(',')[0]
-                                formatted_date = f"{day_of_week}, {date_obj.strftime('%B %d, %Y')}"
-                                formatted_projection += formatted_date
-                            except Exception:
-                                formatted_projection += parts
-                        else:
-                            formatted_projection += parts
-                    else:
-                        formatted_projection += date_str
-        else:
-            # If no raw_date, use the 'date' field
-            date_str = projected_game_dict.get('date', '')
-            if date_str:
-                # Try to clean up the date string if it has European format in parentheses
-                if '(' in date_str:
-                    parts = date_str.split('(')[0].strip()
-                    # If it's in YYYY-MM-DD format, convert it
-                    if re.match(r'\w+, \d{4}-\d{2}-\d{2}', parts):
-                        try:
-                            # Extract just the date part
-                            date_part = parts.split(', ')[1]
-                            date_obj = datetime.strptime(date_part, '%Y-%m-%d')
-                            day_of_week = parts.split(',')[0]
-                            formatted_date = f"{day_of_week}, {date_obj.strftime('%B %d, %Y')}"
-                            formatted_projection += formatted_date
-                        except Exception:
-                            formatted_projection += parts
-                    else:
-                        formatted_projection += parts
-                else:
-                    formatted_projection += date_str
-    else:
-        # Fallback to raw date if structured data isn't available
-        projected_date_raw = stats.get('flat_stats', {}).get('Projected Date of Record-Breaking Goal', 'N/A')
-        if projected_date_raw and projected_date_raw != 'N/A':
-            try:
-                date_obj = datetime.strptime(projected_date_raw, '%m/%d/%Y')
-                formatted_projection += date_obj.strftime('%A, %B %d, %Y')
-            except Exception:
-                formatted_projection += projected_date_raw
+    Args:
+        projected_game_dict: The 'projected_game' record from the nested stats
+        
+    Returns:
+        str: Description such as "Saturday, April 12, 2025, 12:30 PM ET vs Columbus Blue Jackets (Away)"
+    """
+    parts = [format_projected_date(projected_game_dict.get('raw_date', ''), projected_game_dict.get('date', ''))]
     
     # Add time if available
-    if projected_game_dict and 'time' in projected_game_dict:
-        game_time = projected_game_dict['time']
-        if game_time:
-            formatted_projection += f", {game_time}"
+    game_time = projected_game_dict.get('time')
+    if game_time:
+        parts.append(f", {game_time}")
     
     # Add team and location
+    opponent = projected_game_dict.get('opponent') or ''
+    team = opponent.partition(',')[0].strip()
+    
+    if team:
+        parts.append(f" vs {team}")
+        location = projected_game_dict.get('location')
+        if location:
+            # Make sure location is properly formatted with parentheses
+            if location[0] == '(' and location[-1] == ')':
+                parts.append(f" {location}")
+            else:
+                parts.append(f" ({location})")
+    
+    return ''.join(parts)
+
+
+def format_flat_projection(flat_stats):
+    """
+    Describe the projected record-breaking game from the flat stats
+    
+    Args:
+        flat_stats: The flat stats dictionary
+        
+    Returns:
+        str: Description of the projected game, or '' if there isn't one
+    """
+    parts = []
+    
+    projected_date_raw = flat_stats.get('Projected Date of Record-Breaking Goal', 'N/A')
+    if projected_date_raw and projected_date_raw != 'N/A':
+        date_obj = parse_mdy_date(projected_date_raw)
+        if date_obj:
+            parts.append(format_full_date(date_obj))
+        else:
+            parts.append(projected_date_raw)
+    
+    projected_game_raw = flat_stats.get('Projected Record-Breaking Game', 'N/A')
+    if projected_game_raw and projected_game_raw != 'N/A' and 'vs' in projected_game_raw:
+        # Try to extract time information
+        time_match = GAME_TIME_PATTERN.search(projected_game_raw)
+        if time_match:
+            parts.append(f", {time_match.group(1)}")
+        
+        # Keep only the text between the first and any second 'vs'
+        team_info = projected_game_raw.partition('vs')[2].partition('vs')[0].strip()
+        
+        # Extract location if present
+        if '(Home)' in team_info:
+            team = team_info.replace('(Home)', '').strip()
+            parts.append(f" vs {team} (Home)")
+        elif '(Away)' in team_info:
+            team = team_info.replace('(Away)', '').strip()
+            parts.append(f" vs {team} (Away)")
+        else:
+            parts.append(f" vs {team_info}")
+    
+    return ''.join(parts)
+
+
+def get_page_fields(stats):
+    """
+    Get the values the page shows from the Ovechkin stats
+    
+    Args:
+        stats: Dictionary containing Ovechkin's stats
+        
+    Returns:
+        tuple: Total goals and goals needed as text, and the formatted projection
+    """
+    # Extract key information
+    flat_stats = stats.get('flat_stats') or EMPTY_MAPPING
+    total_goals = flat_stats.get('Total Number of Goals', 'N/A')
+    goals_needed = flat_stats.get('Goals to Beat Gretzy', 'N/A')
+    
+    # Get the projected game dictionary from nested stats which has structured data
+    record = (stats.get('nested_stats') or EMPTY_MAPPING).get('record') or EMPTY_MAPPING
+    projected_game_dict = record.get('projected_game') or EMPTY_MAPPING
+    
+    # Format the projection string exactly as requested: "Saturday, April 12, 2025, 12:30 PM ET vs Columbus Blue Jackets (Away)"
     if projected_game_dict:
-        team = projected_game_dict.get('opponent', '').split(',')[0].strip()
-        location = projected_game_dict.get('location', '')
-        
-        if team:
-            formatted_projection += f" vs {team}"
-            if location:
-                # Make sure location is properly formatted with parentheses
-                if location.startswith('(') and location.endswith(')'):
-                    formatted_projection += f" {location}"
-                else:
-                    formatted_projection += f" ({location})"
+        formatted_projection = "Record-Breaking Game: " + format_game_projection(projected_game_dict)
     else:
-        # Fallback to raw game info if structured data isn't available
-        projected_game_raw = stats.get('flat_stats', {}).get('Projected Record-Breaking Game', 'N/A')
-        if projected_game_raw and projected_game_raw != 'N/A' and 'vs' in projected_game_raw:
-            # Try to extract time information
-            time_match = re.search(r'(\d{1,2}:\d{2}\s*(?:AM|PM)\s*ET)', projected_game_raw)
-            if time_match and not ", " + time_match.group(1) in formatted_projection:
-                formatted_projection += f", {time_match.group(1)}"
-            
-            team_info = projected_game_raw.split('vs')[1].strip()
-            
-            # Extract location if present
-            if '(Home)' in team_info:
-                team = team_info.replace('(Home)', '').strip()
-                formatted_projection += f" vs {team} (Home)"
-            elif '(Away)' in team_info:
-                team = team_info.replace('(Away)', '').strip()
-                formatted_projection += f" vs {team} (Away)"
-            else:
-                formatted_projection += f" vs {team_info}"
+        # Fallback to the flat stats if structured data isn't available
+        formatted_projection = "Record-Breaking Game: " + format_flat_projection(flat_stats)
     
-    # Calculate progress percentage
-    try:
-        progress_pct = round((int(total_goals) / 894) * 100, 1)
-        progress_pct_str = str(progress_pct)
-    except (ValueError, ZeroDivisionError):
-        progress_pct = 0
-        progress_pct_str = "0"
+    # The goal counts are converted to text once here rather than at each of
+    # their three places in the template, which also lets 890 and '890' share
+    # a cache entry
+    return str(total_goals), str(goals_needed), formatted_projection
+
+
+def render_page(fields):
+    """
+    Render the page for the values from get_page_fields, stamped with the current time
     
+    Args:
+        fields: Tuple returned by get_page_fields
+        
+    Returns:
+        str: HTML content for the website
+    """
     # Current time in ET for the footer
-    current_time = datetime.now(pytz.timezone('America/New_York')).strftime('%Y-%m-%d %I:%M:%S %p ET')
+    current_time = datetime.now(EASTERN_TZ).strftime('%Y-%m-%d %I:%M:%S %p ET')
     
-    # Create HTML content with Washington Capitals colors and responsive design
-    html = f"""<!DOCTYPE html>
+    # The page only changes with the stats, so it is rendered once per set of
+    # stats and the update time is filled in afterwards
+    return render_html(*fields).replace(CURRENT_TIME_PLACEHOLDER, current_time)
+
+
+# Page template with Washington Capitals colors and responsive design. The
+# fields are $total_goals, $goals_needed, $formatted_projection and
+# $current_time, so the braces in the CSS and scripts are written as they are
+HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <!-- Meta tags for proper responsive behavior and character encoding -->
@@ -171,13 +319,13 @@ def generate_html_content(stats):
     <title>Ovechkin Goal Tracker | Washington Capitals</title>
     
     <!-- SEO Meta Tags -->
-    <meta name="description" content="Track Alex Ovechkin's pursuit of Wayne Gretzky's all-time NHL goal record of 894 goals. Currently at {total_goals} goals with {goals_needed} to go.">
+    <meta name="description" content="Track Alex Ovechkin's pursuit of Wayne Gretzky's all-time NHL goal record of 894 goals. Currently at $total_goals goals with $goals_needed to go.">
     <meta name="keywords" content="Alex Ovechkin, Washington Capitals, NHL, hockey, goal record, Wayne Gretzky, The Great Eight">
     <meta name="author" content="Ovechkin Goal Tracker">
     
     <!-- Open Graph / Social Media Meta Tags -->
     <meta property="og:title" content="The GR8 Chase - Ovechkin Goal Tracker">
-    <meta property="og:description" content="Alex Ovechkin has scored {total_goals} goals and needs {goals_needed} more to break Wayne Gretzky's NHL record.">
+    <meta property="og:description" content="Alex Ovechkin has scored $total_goals goals and needs $goals_needed more to break Wayne Gretzky's NHL record.">
     <meta property="og:type" content="website">
     <meta property="og:image" content="https://upload.wikimedia.org/wikipedia/commons/f/f3/Alex_Ovechkin_2018-05-21.jpg">
     
@@ -193,7 +341,7 @@ def generate_html_content(stats):
     
     <style>
         /* CSS Variables for consistent theming and easy updates */
-        :root {{
+        :root {
             /* Washington Capitals colors */
             --caps-red: #C8102E;       /* Primary red */
             --caps-blue: #041E42;      /* Navy blue */
@@ -218,16 +366,16 @@ def generate_html_content(stats):
             --font-xxl: 2rem;
             --font-huge: 3rem;
             --font-massive: 4.5rem;
-        }}
+        }
         
         /* Base styles and CSS Reset */
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Roboto', sans-serif;
             line-height: 1.6;
             background-color: var(--caps-red);
@@ -239,9 +387,9 @@ def generate_html_content(stats):
             background-image: linear-gradient(135deg, var(--caps-red) 0%, #a00a24 100%);
             position: relative;
             overflow-x: hidden;
-        }}
+        }
         
-        body::before {{
+        body::before {
             content: '';
             position: absolute;
             top: 0;
@@ -256,10 +404,10 @@ def generate_html_content(stats):
             pointer-events: none;
             z-index: -1;
             filter: contrast(1.2) saturate(1.2);
-        }}
+        }
         
         /* Hero section with Ovechkin's stats - more compact */
-        .hero {{
+        .hero {
             background-color: var(--caps-blue);
             color: var(--caps-white);
             padding: var(--spacing-lg) var(--spacing-xl);
@@ -275,14 +423,14 @@ def generate_html_content(stats):
             margin-top: var(--spacing-xl);
             border: 5px solid var(--caps-gold);
             animation: pulse 2s infinite alternate;
-        }}
+        }
         
-        @keyframes pulse {{
-            0% {{ box-shadow: 0 0 20px var(--caps-gold); }}
-            100% {{ box-shadow: 0 0 40px var(--caps-gold); }}
-        }}
+        @keyframes pulse {
+            0% { box-shadow: 0 0 20px var(--caps-gold); }
+            100% { box-shadow: 0 0 40px var(--caps-gold); }
+        }
         
-        .hero::before {{
+        .hero::before {
             content: '';
             position: absolute;
             top: 0;
@@ -291,9 +439,9 @@ def generate_html_content(stats):
             height: 100%;
             background-image: url('https://www.transparenttextures.com/patterns/hockey.png');
             opacity: 0.15;
-        }}
+        }
         
-        .hero h1 {{
+        .hero h1 {
             font-size: var(--font-massive);
             margin-bottom: var(--spacing-md);
             font-family: 'Montserrat', sans-serif;
@@ -306,14 +454,14 @@ def generate_html_content(stats):
             color: var(--caps-gold);
             -webkit-text-stroke: 2px var(--caps-blue);
             animation: glow 2s infinite alternate;
-        }}
+        }
         
-        @keyframes glow {{
-            0% {{ text-shadow: 0 0 10px var(--caps-gold), 0 0 20px var(--caps-gold); }}
-            100% {{ text-shadow: 0 0 20px var(--caps-gold), 0 0 30px var(--caps-gold); }}
-        }}
+        @keyframes glow {
+            0% { text-shadow: 0 0 10px var(--caps-gold), 0 0 20px var(--caps-gold); }
+            100% { text-shadow: 0 0 20px var(--caps-gold), 0 0 30px var(--caps-gold); }
+        }
         
-        .hero h1::after {{
+        .hero h1::after {
             content: '';
             position: absolute;
             bottom: -10px;
@@ -323,18 +471,18 @@ def generate_html_content(stats):
             height: 4px;
             background-color: var(--caps-red);
             border-radius: 3px;
-        }}
+        }
         
-        .hero p {{
+        .hero p {
             font-size: var(--font-xl);
             opacity: 0.95;
             max-width: 800px;
             margin: var(--spacing-md) auto 0;
             font-weight: 700;
             color: var(--caps-white);
-        }}
+        }
         
-        .projection-banner {{
+        .projection-banner {
             background-color: var(--caps-red);
             color: var(--caps-white);
             padding: var(--spacing-md) var(--spacing-lg);
@@ -348,35 +496,35 @@ def generate_html_content(stats):
             z-index: 1;
             border: 3px solid var(--caps-gold);
             animation: float 3s ease-in-out infinite;
-        }}
+        }
         
-        @keyframes float {{
-            0% {{ transform: translateY(0px); }}
-            50% {{ transform: translateY(-10px); }}
-            100% {{ transform: translateY(0px); }}
-        }}
+        @keyframes float {
+            0% { transform: translateY(0px); }
+            50% { transform: translateY(-10px); }
+            100% { transform: translateY(0px); }
+        }
         
-        .projection-banner i {{
+        .projection-banner i {
             margin-right: var(--spacing-xs);
             color: var(--caps-gold);
-        }}
+        }
         
         /* Top stats and video layout */
-        .top-content {{
+        .top-content {
             display: grid;
             grid-template-columns: 1fr 1fr 2fr;
             gap: var(--spacing-md);
             margin-bottom: var(--spacing-lg);
             width: 100%;
             align-items: stretch;
-        }}
+        }
         
-        .top-content .stat-card {{
+        .top-content .stat-card {
             margin: 0;
             min-height: 280px;
-        }}
+        }
         
-        .top-content .video-section {{
+        .top-content .video-section {
             margin: 0;
             grid-column: 3;
             height: 100%;
@@ -388,9 +536,9 @@ def generate_html_content(stats):
             box-shadow: 0 12px 24px rgba(0, 0, 0, 0.15);
             border: 4px solid var(--caps-gold);
             min-height: 280px;
-        }}
+        }
         
-        .top-content .video-section h3 {{
+        .top-content .video-section h3 {
             margin-top: 0;
             margin-bottom: var(--spacing-sm);
             color: var(--caps-blue);
@@ -398,9 +546,9 @@ def generate_html_content(stats):
             font-weight: 700;
             position: relative;
             display: inline-block;
-        }}
+        }
         
-        .top-content .video-section h3::after {{
+        .top-content .video-section h3::after {
             content: '';
             position: absolute;
             bottom: -8px;
@@ -409,22 +557,22 @@ def generate_html_content(stats):
             height: 3px;
             background-color: var(--caps-red);
             border-radius: 3px;
-        }}
+        }
         
-        .top-content .video-container {{
+        .top-content .video-container {
             flex: 1;
             margin-bottom: 0;
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
+        }
         
-        .top-content .stats-container {{
+        .top-content .stats-container {
             display: contents;
-        }}
+        }
         
         /* Main content wrapper - centers content and uses grid layout */
-        .content-wrapper {{
+        .content-wrapper {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: var(--spacing-md);
@@ -432,17 +580,17 @@ def generate_html_content(stats):
             max-width: 1200px;
             margin-bottom: var(--spacing-md);
             padding: 0 var(--spacing-md);
-        }}
+        }
         
         /* Stats cards styling */
-        .stats-container {{
+        .stats-container {
             display: flex;
             justify-content: space-between;
             gap: var(--spacing-md);
             margin-bottom: var(--spacing-lg);
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background-color: var(--caps-white);
             border-radius: 12px;
             padding: var(--spacing-md);
@@ -454,9 +602,9 @@ def generate_html_content(stats):
             flex-direction: column;
             justify-content: center;
             min-height: 280px; /* Fixed height to match video */
-        }}
+        }
         
-        .stat-card h3 {{
+        .stat-card h3 {
             color: var(--caps-blue);
             margin-bottom: var(--spacing-md);
             font-size: var(--font-xl);
@@ -464,9 +612,9 @@ def generate_html_content(stats):
             position: relative;
             display: inline-block;
             font-weight: 700;
-        }}
+        }
         
-        .stat-card h3::after {{
+        .stat-card h3::after {
             content: '';
             position: absolute;
             bottom: -8px;
@@ -475,9 +623,9 @@ def generate_html_content(stats):
             height: 3px;
             background-color: var(--caps-red);
             border-radius: 3px;
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             font-size: var(--font-huge);
             font-weight: bold;
             color: var(--caps-red);
@@ -486,15 +634,15 @@ def generate_html_content(stats):
             text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
             font-family: 'Montserrat', sans-serif;
             position: relative;
-        }}
+        }
         
-        .stat-value.record {{
+        .stat-value.record {
             color: var(--caps-gold);
             font-size: calc(var(--font-huge) * 1.2);
             text-shadow: 2px 2px 4px rgba(200, 16, 46, 0.3);
-        }}
+        }
         
-        .stat-value::before {{
+        .stat-value::before {
             content: '';
             position: absolute;
             width: 40px;
@@ -505,14 +653,14 @@ def generate_html_content(stats):
             left: 50%;
             top: 50%;
             transform: translate(-50%, -50%) scale(3.5);
-        }}
+        }
         
-        .stat-value.record::before {{
+        .stat-value.record::before {
             background-color: rgba(255, 215, 0, 0.15);
-        }}
+        }
         
         /* Records section - showcases Ovechkin's NHL records */
-        .records-section {{
+        .records-section {
             background-color: var(--caps-white);
             border-radius: 12px;
             padding: var(--spacing-lg);
@@ -523,9 +671,9 @@ def generate_html_content(stats):
             position: relative;
             overflow: hidden;
             animation: pulse 2s infinite alternate;
-        }}
+        }
         
-        .records-section::before {{
+        .records-section::before {
             content: '';
             position: absolute;
             top: 0;
@@ -534,9 +682,9 @@ def generate_html_content(stats):
             height: 150px;
             background-image: radial-gradient(circle, rgba(4, 30, 66, 0.05) 0%, transparent 70%);
             border-radius: 50%;
-        }}
+        }
         
-        .records-section h3 {{
+        .records-section h3 {
             color: var(--caps-blue);
             margin-bottom: var(--spacing-md);
             font-size: var(--font-xl);
@@ -544,9 +692,9 @@ def generate_html_content(stats):
             position: relative;
             display: inline-block;
             font-weight: 700;
-        }}
+        }
         
-        .records-section h3::after {{
+        .records-section h3::after {
             content: '';
             position: absolute;
             bottom: -8px;
@@ -555,16 +703,16 @@ def generate_html_content(stats):
             height: 3px;
             background-color: var(--caps-red);
             border-radius: 3px;
-        }}
+        }
         
-        .records-container {{
+        .records-container {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: var(--spacing-md);
             margin-top: var(--spacing-md);
-        }}
+        }
         
-        .record-item {{
+        .record-item {
             background-color: var(--caps-light-gray);
             padding: var(--spacing-md);
             border-radius: 8px;
@@ -573,14 +721,14 @@ def generate_html_content(stats):
             align-items: center;
             transition: transform 0.3s ease, box-shadow 0.3s ease;
             border-left: 4px solid var(--caps-red);
-        }}
+        }
         
-        .record-item:hover {{
+        .record-item:hover {
             transform: translateY(-5px);
             box-shadow: 0 12px 24px rgba(0, 0, 0, 0.15);
-        }}
+        }
         
-        .record-icon {{
+        .record-icon {
             font-size: var(--font-huge);
             margin-right: var(--spacing-md);
             color: var(--caps-gold);
@@ -592,26 +740,26 @@ def generate_html_content(stats):
             align-items: center;
             justify-content: center;
             box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-        }}
+        }
         
-        .record-details {{
+        .record-details {
             font-size: var(--font-medium);
-        }}
+        }
         
-        .record-details h4 {{
+        .record-details h4 {
             font-weight: bold;
             margin-bottom: var(--spacing-xs);
             color: var(--caps-blue);
             font-size: var(--font-large);
-        }}
+        }
         
-        .record-details p {{
+        .record-details p {
             color: var(--caps-dark-gray);
             font-size: var(--font-medium);
-        }}
+        }
         
         /* Video section styling */
-        .video-section {{
+        .video-section {
             background-color: var(--caps-white);
             border-radius: 12px;
             padding: var(--spacing-lg);
@@ -623,9 +771,9 @@ def generate_html_content(stats):
             overflow: hidden;
             margin-top: var(--spacing-lg);
             margin-bottom: var(--spacing-lg);
-        }}
+        }
         
-        .video-section h3 {{
+        .video-section h3 {
             color: var(--caps-blue);
             margin-bottom: var(--spacing-md);
             font-size: var(--font-xl);
@@ -633,9 +781,9 @@ def generate_html_content(stats):
             position: relative;
             display: inline-block;
             font-weight: 700;
-        }}
+        }
         
-        .video-section h3::after {{
+        .video-section h3::after {
             content: '';
             position: absolute;
             bottom: -8px;
@@ -644,9 +792,9 @@ def generate_html_content(stats):
             height: 3px;
             background-color: var(--caps-red);
             border-radius: 3px;
-        }}
+        }
         
-        .video-container {{
+        .video-container {
             position: relative;
             width: 100%;
             padding-bottom: 56.25%; /* 16:9 aspect ratio */
@@ -654,9 +802,9 @@ def generate_html_content(stats):
             overflow: hidden;
             max-width: 800px;
             margin: 0 auto;
-        }}
+        }
         
-        .video-container iframe {{
+        .video-container iframe {
             position: absolute;
             top: 0;
             left: 0;
@@ -665,65 +813,65 @@ def generate_html_content(stats):
             border-radius: 8px;
             box-shadow: 0 8px 16px rgba(0, 0, 0, 0.1);
             border: none;
-        }}
+        }
         
         /* Responsive design adjustments */
-        @media (max-width: 768px) {{
-            .stats-container {{
+        @media (max-width: 768px) {
+            .stats-container {
                 flex-direction: column;
                 gap: var(--spacing-md);
-            }}
+            }
             
-            .stat-card {{
+            .stat-card {
                 width: 100%;
                 min-height: 220px;
-            }}
+            }
             
-            .hero h1 {{
+            .hero h1 {
                 font-size: var(--font-xxl);
-            }}
+            }
             
-            .hero p {{
+            .hero p {
                 font-size: var(--font-large);
-            }}
+            }
             
-            .records-grid {{
+            .records-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .video-container {{
+            .video-container {
                 padding-bottom: 75%; /* Adjusted aspect ratio for mobile */
-            }}
+            }
             
-            .top-content {{
+            .top-content {
                 grid-template-columns: 1fr;
                 grid-template-rows: auto auto auto;
-            }}
+            }
             
-            .top-content .video-section {{
+            .top-content .video-section {
                 grid-column: 1;
                 margin-top: var(--spacing-md);
                 min-height: 220px;
-            }}
-        }}
+            }
+        }
         
         /* Animation for page elements */
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(20px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
         
-        .hero, .stat-card, .records-section {{
+        .hero, .stat-card, .records-section {
             animation: fadeIn 0.8s ease-out forwards;
-        }}
+        }
         
-        .hero {{ animation-delay: 0s; }}
-        .stat-card:nth-child(1) {{ animation-delay: 0.1s; }}
-        .stat-card:nth-child(2) {{ animation-delay: 0.2s; }}
-        .records-section {{ animation-delay: 0.3s; }}
+        .hero { animation-delay: 0s; }
+        .stat-card:nth-child(1) { animation-delay: 0.1s; }
+        .stat-card:nth-child(2) { animation-delay: 0.2s; }
+        .records-section { animation-delay: 0.3s; }
         
         /* Footer with update time */
-        footer {{
+        footer {
             background-color: var(--caps-blue);
             color: var(--caps-white);
             padding: var(--spacing-md);
@@ -732,9 +880,9 @@ def generate_html_content(stats):
             margin-top: auto;
             font-size: var(--font-small);
             position: relative;
-        }}
+        }
         
-        footer::before {{
+        footer::before {
             content: '';
             position: absolute;
             top: 0;
@@ -742,26 +890,26 @@ def generate_html_content(stats):
             width: 100%;
             height: 4px;
             background: linear-gradient(90deg, var(--caps-white) 0%, var(--caps-white) 30%, var(--caps-red) 30%, var(--caps-red) 100%);
-        }}
+        }
         
-        .update-time {{
+        .update-time {
             font-style: italic;
             opacity: 0.8;
-        }}
+        }
         
-        .hero-link {{
+        .hero-link {
             color: var(--caps-white);
             text-decoration: none;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .hero-link:hover {{
+        .hero-link:hover {
             text-decoration: underline;
             color: var(--caps-silver);
-        }}
+        }
         
         /* Accessibility styles */
-        .visually-hidden {{
+        .visually-hidden {
             position: absolute;
             width: 1px;
             height: 1px;
@@ -770,35 +918,35 @@ def generate_html_content(stats):
             overflow: hidden;
             clip: rect(0, 0, 0, 0);
             border: 0;
-        }}
+        }
         
-        .footer-link {{
+        .footer-link {
             color: var(--caps-white);
             text-decoration: underline;
             opacity: 0.9;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .footer-link:hover {{
+        .footer-link:hover {
             opacity: 1;
             text-decoration: none;
             color: var(--caps-silver);
-        }}
+        }
         
-        .attribution {{
+        .attribution {
             margin-top: var(--spacing-sm);
             font-size: 0.8rem;
             opacity: 0.8;
-        }}
+        }
         
-        .built-by {{
+        .built-by {
             margin-top: var(--spacing-sm);
             font-size: 0.8rem;
             opacity: 0.8;
-        }}
+        }
         
         /* Refresh button styling */
-        .refresh-button {{
+        .refresh-button {
             background-color: var(--caps-blue);
             color: var(--caps-white);
             border: none;
@@ -808,36 +956,36 @@ def generate_html_content(stats):
             cursor: pointer;
             font-size: 0.8rem;
             transition: background-color 0.3s ease;
-        }}
+        }
         
-        .refresh-button:hover {{
+        .refresh-button:hover {
             background-color: var(--caps-red);
-        }}
+        }
     </style>
 </head>
 <body>
     <!-- Schema.org structured data for better search engine understanding -->
     <script type="application/ld+json">
-    {{
+    {
         "@context": "https://schema.org",
         "@type": "SportsEvent",
         "name": "Alex Ovechkin's NHL Goal Record Chase",
         "description": "Tracking Alex Ovechkin's pursuit of Wayne Gretzky's all-time NHL goal record of 894 goals.",
-        "performer": {{
+        "performer": {
             "@type": "Person",
             "name": "Alex Ovechkin",
-            "affiliation": {{
+            "affiliation": {
                 "@type": "SportsTeam",
                 "name": "Washington Capitals"
-            }}
-        }},
-        "organizer": {{
+            }
+        },
+        "organizer": {
             "@type": "Organization",
             "name": "National Hockey League",
             "url": "https://www.nhl.com/"
-        }},
-        "startDate": "{formatted_projection}"
-    }}
+        },
+        "startDate": "$formatted_projection"
+    }
     </script>
     
     <header>
@@ -854,7 +1002,7 @@ def generate_html_content(stats):
             <h1>The GR8 Chase</h1>
             <p><a href="https://www.nhl.com/capitals/player/alex-ovechkin-8471214" target="_blank" class="hero-link">Alex Ovechkin</a> has officially surpassed Wayne Gretzky to become the NHL's all-time leading goal scorer!</p>
             <div class="projection-banner">
-                <i class="fas fa-calendar-alt"></i> {formatted_projection}
+                <i class="fas fa-calendar-alt"></i> $formatted_projection
             </div>
         </div>
         
@@ -862,13 +1010,13 @@ def generate_html_content(stats):
             <div class="stats-container">
                 <div class="stat-card" id="stats" aria-labelledby="current-goals">
                     <h3 id="current-goals">Ovechkin's Goals</h3>
-                    <span class="stat-value record" aria-live="polite">{total_goals}</span>
+                    <span class="stat-value record" aria-live="polite">$total_goals</span>
                     <p>Current NHL career goals</p>
                 </div>
                 
                 <div class="stat-card" aria-labelledby="goals-needed">
                     <h3 id="goals-needed">Goals to Break Record</h3>
-                    <span class="stat-value" aria-live="polite">{goals_needed}</span>
+                    <span class="stat-value" aria-live="polite">$goals_needed</span>
                     <p>Goals needed to surpass Gretzky</p>
                 </div>
             </div>
@@ -919,22 +1067,198 @@ def generate_html_content(stats):
     </main>
     
     <footer>
-        <p>Last updated: <span class="update-time">{current_time}</span> <button id="refresh-btn" class="refresh-button"><i class="fas fa-sync-alt"></i> Refresh</button></p>
+        <p>Last updated: <span class="update-time">$current_time</span> <button id="refresh-btn" class="refresh-button"><i class="fas fa-sync-alt"></i> Refresh</button></p>
         <p class="built-by">Built by <a href="http://github.com/PaulDuvall/" class="footer-link" target="_blank" rel="noopener">Paul Duvall</a></p>
         <p class="attribution">Background image: <a href="https://commons.wikimedia.org/wiki/File:Alex_Ovechkin_2018-05-21.jpg" class="footer-link">Alex Ovechkin</a> by Michael Miller, <a href="https://creativecommons.org/licenses/by-sa/4.0/" class="footer-link">CC BY-SA 4.0</a></p>
     </footer>
     
     <script>
         // Add cache-busting to ensure fresh data
-        document.getElementById('refresh-btn').addEventListener('click', function() {{
+        document.getElementById('refresh-btn').addEventListener('click', function() {
             location.reload();
-        }});
+        });
     </script>
 </body>
 </html>
 """
+
+# The template split around its fields, with the static text at even indexes
+# and the field names at odd ones
+HTML_TEMPLATE_PARTS = tuple(
+    re.split(r'\$(total_goals|goals_needed|formatted_projection|current_time)\b', HTML_TEMPLATE)
+)
+
+
+@functools.lru_cache(maxsize=8)
+def render_html(total_goals, goals_needed, formatted_projection):
+    """
+    Render the page for a set of stats
+    
+    Args:
+        total_goals: Ovechkin's career goal total, as text
+        goals_needed: Goals still needed to beat Gretzky's record, as text
+        formatted_projection: Description of the projected record-breaking game
+        
+    Returns:
+        str: HTML content with CURRENT_TIME_PLACEHOLDER in place of the update time
+    """
+    # Join the static text with the field values rather than formatting the whole template
+    values = {
+        'total_goals': total_goals,
+        'goals_needed': goals_needed,
+        'formatted_projection': formatted_projection,
+        'current_time': CURRENT_TIME_PLACEHOLDER
+    }
+    return ''.join(
+        values[part] if index % 2 else part
+        for index, part in enumerate(HTML_TEMPLATE_PARTS)
+    )
+
+
+def find_tracker_root(start_dir):
+    """
+    Find the nearest directory at or above start_dir that contains the ovechkin_tracker package
+    
+    Args:
+        start_dir: Directory to start searching from
+        
+    Returns:
+        str: The directory containing ovechkin_tracker, or None if there isn't one
+    """
+    directory = start_dir
+    while True:
+        if os.path.exists(os.path.join(directory, 'ovechkin_tracker', '__init__.py')):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def load_ovechkin_data():
+    """
+    Get the OvechkinData class. If it couldn't be imported when this module
+    loaded, retry from the nearest directory containing ovechkin_tracker.
+    
+    Returns:
+        type: The OvechkinData class, or None if it can't be imported
+    """
+    global OvechkinData
+    if OvechkinData is None:
+        tracker_root = find_tracker_root(SCRIPT_DIR)
+        if tracker_root is None:
+            logger.warning(f"ovechkin_tracker not found above {SCRIPT_DIR}")
+            return None
+        if tracker_root not in sys.path:
+            sys.path.insert(0, tracker_root)
+        try:
+            OvechkinData = importlib.import_module('ovechkin_tracker.ovechkin_data').OvechkinData
+            logger.info(f"Successfully imported OvechkinData from {tracker_root}")
+        except ImportError as e:
+            logger.warning(f"In-process import failed: {str(e)}")
+    return OvechkinData
+
+
+def write_all(fd, data):
+    """Write all of data to a file descriptor, continuing after partial writes"""
+    remaining = memoryview(data)
+    while remaining:
+        remaining = remaining[os.write(fd, remaining):]
+
+
+def read_page_signature(index_path, signature_path):
+    """
+    Get the signature recorded for index.html, if the page is still the one it was recorded for
+    
+    Args:
+        index_path: Path of the generated index.html
+        signature_path: Path of its signature sidecar file
+        
+    Returns:
+        str: The recorded signature, or None if there is none, the page has been
+        written by something else since, or the page is older than MAX_PAGE_AGE
+    """
+    try:
+        with open(signature_path, 'r', encoding='utf-8') as f:
+            signature, inode, mtime_ns, size = f.read().split()
+        recorded_stat = (int(inode), int(mtime_ns), int(size))
+        page_stat = os.stat(index_path)
+    except (OSError, ValueError):
+        return None
     
-    return html
+    if (page_stat.st_ino, page_stat.st_mtime_ns, page_stat.st_size) != recorded_stat:
+        return None
+    if time.time() - page_stat.st_mtime > MAX_PAGE_AGE:
+        return None
+    return signature
+
+
+def write_page_signature(index_path, signature_path, signature):
+    """
+    Record the signature of the page just written to index.html, along with the page's stat
+    
+    Args:
+        index_path: Path of the generated index.html
+        signature_path: Path of its signature sidecar file
+        signature: Signature of the page's contents
+    """
+    page_stat = os.stat(index_path)
+    with open(signature_path, 'w', encoding='utf-8') as f:
+        f.write(f"{signature} {page_stat.st_ino} {page_stat.st_mtime_ns} {page_stat.st_size}\n")
+
+
+def copy_if_changed(source, target):
+    """
+    Copy source to target unless target is already a copy of it
+    
+    Args:
+        source: Path of the file to copy
+        target: Path to copy it to
+        
+    Returns:
+        bool: True if the file was copied, False if target was already up to date
+    """
+    try:
+        source_stat = os.stat(source)
+        target_stat = os.stat(target)
+        if source_stat.st_size == target_stat.st_size and source_stat.st_mtime <= target_stat.st_mtime:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    # Warm invocations skip the copy, so shutil is only imported when it's needed
+    import shutil
+    shutil.copy2(source, target)
+    return True
+
+
+def get_stats_from_subprocess():
+    """
+    Get the Ovechkin stats by running OvechkinData in a separate python3 process
+    
+    Returns:
+        dict: The stats, or None if the process failed
+    """
+    # Only this fallback needs these, so they stay out of the module's import time
+    import json
+    import subprocess
+    
+    cmd = [
+        'python3', '-c',
+        'from ovechkin_tracker.ovechkin_data import OvechkinData; import json; stats = OvechkinData().get_all_stats(); print(json.dumps(stats))'
+    ]
+    
+    try:
+        # Run the command from the project root to ensure proper imports
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        error_msg = f"ERROR: Failed to get Ovechkin stats: {e.stderr}"
+        logger.error(error_msg)
+        print(error_msg)
+        return None
+    
+    # Parse the JSON output
+    return json.loads(result.stdout)
 
 
 def update_website():
@@ -945,38 +1269,19 @@ def update_website():
         bool: True if website was updated successfully, False otherwise
     """
     try:
-        # Get the project root directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        
         # Check if running in Lambda environment
         is_lambda = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
         
-        # Try different approaches to get the Ovechkin stats
-        # First, try direct import if the module is in the path
-        try:
-            logger.info("Attempting direct import of OvechkinData...")
-            # Add project root to path if not already there
-            if project_root not in sys.path and os.path.exists(os.path.join(project_root, 'ovechkin_tracker')):
-                sys.path.insert(0, project_root)
-                
-            # Try direct import
-            from ovechkin_tracker.ovechkin_data import OvechkinData
-            stats = OvechkinData().get_all_stats()
-            logger.info("Successfully imported OvechkinData directly")
-        except ImportError as e:
-            logger.warning(f"Direct import failed: {str(e)}. Trying subprocess approach...")
+        # Get the Ovechkin stats, in-process if OvechkinData can be imported
+        ovechkin_data_class = load_ovechkin_data()
+        if ovechkin_data_class is not None:
+            stats = ovechkin_data_class().get_all_stats()
+        else:
+            logger.warning("Trying subprocess approach...")
             # Fallback to subprocess approach for local environment
-            cmd = [
-                'python3', '-c',
-                'from ovechkin_tracker.ovechkin_data import OvechkinData; import json; stats = OvechkinData().get_all_stats(); print(json.dumps(stats))'
-            ]
-            
-            # Run the command from the project root to ensure proper imports
-            result = subprocess.run(cmd, cwd=project_root, capture_output=True, text=True, check=True)
-            
-            # Parse the JSON output
-            stats = json.loads(result.stdout)
+            stats = get_stats_from_subprocess()
+            if stats is None:
+                return False
         
         if 'error' in stats:
             error_msg = f"ERROR: Failed to calculate stats: {stats['error']}"
@@ -984,9 +1289,6 @@ def update_website():
             print(error_msg)
             return False
         
-        # Generate HTML content
-        html_content = generate_html_content(stats)
-        
         # Define the path to the index.html file
         # Use /tmp directory if running in Lambda environment
         if is_lambda:
@@ -994,10 +1296,21 @@ def update_website():
             index_path = os.path.join(static_dir, 'index.html')
             logger.info(f"Running in Lambda environment, using temp directory: {static_dir}")
         else:
-            static_dir = os.path.join(script_dir, 'static')
+            static_dir = os.path.join(SCRIPT_DIR, 'static')
             index_path = os.path.join(static_dir, 'index.html')
             logger.info(f"Running in local environment, using directory: {static_dir}")
         
+        # Leave the page alone if it already shows these stats
+        page_fields = get_page_fields(stats)
+        signature = 'standard-' + hashlib.sha1(repr(page_fields).encode('utf-8')).hexdigest()
+        signature_path = os.path.join(os.path.dirname(static_dir), PAGE_SIGNATURE_NAME)
+        if read_page_signature(index_path, signature_path) == signature:
+            logger.info(f"Website at {index_path} is already up to date")
+            return True
+        
+        # Generate HTML content
+        html_content = render_page(page_fields)
+        
         # Create the static directory if it doesn't exist
         os.makedirs(static_dir, exist_ok=True)
         
@@ -1006,30 +1319,27 @@ def update_website():
         os.makedirs(assets_dir, exist_ok=True)
         
         # Copy the gr8.svg file to the assets directory
-        source_svg = os.path.join(script_dir, 'assets', 'gr8.svg')
+        source_svg = os.path.join(SCRIPT_DIR, 'assets', 'gr8.svg')
         target_svg = os.path.join(assets_dir, 'gr8.svg')
         
-        if os.path.exists(source_svg):
-            import shutil
-            shutil.copy2(source_svg, target_svg)
-            logger.info(f"Copied favicon from {source_svg} to {target_svg}")
-        else:
+        if not os.path.exists(source_svg):
             logger.warning(f"Favicon source file not found at {source_svg}")
+        elif copy_if_changed(source_svg, target_svg):
+            logger.info(f"Copied favicon from {source_svg} to {target_svg}")
         
         # Write the HTML content to the file, completely replacing the existing content
-        with open(index_path, 'w') as f:
-            f.write(html_content)
+        fd = os.open(index_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            write_all(fd, html_content.encode('utf-8'))
+        finally:
+            os.close(fd)
+        write_page_signature(index_path, signature_path, signature)
         
         success_msg = f"Website updated successfully at {index_path}"
         logger.info(success_msg)
         print(success_msg)
         return True
         
-    except subprocess.CalledProcessError as e:
-        error_msg = f"ERROR: Failed to get Ovechkin stats: {e.stderr}"
-        logger.error(error_msg)
-        print(error_msg)
-        return False
     except Exception as e:
         error_msg = f"ERROR: Failed to update website: {str(e)}"
         logger.error(error_msg)
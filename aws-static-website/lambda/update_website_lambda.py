@@ -9,24 +9,140 @@ the static website content with the latest Ovechkin stats.
 import os
 import sys
 import logging
+import functools
+import gzip
+import hashlib
 import boto3
 import json
-import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import S3Transfer, TransferConfig
+from botocore.config import Config
 
 # Set up logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Number of files uploaded to S3 at the same time
+UPLOAD_WORKERS = 16
+
+# Shared configuration for every AWS client: at least one pooled HTTPS
+# connection per upload thread, adaptive retries and TCP keep-alive
+AWS_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Content-Type sent with each uploaded file, by extension
+CONTENT_TYPES = {
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+    '.ico': 'image/x-icon'
+}
+
+# Text files are stored gzip-compressed with Content-Encoding set, so
+# CloudFront serves them compressed without compressing them itself
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+GZIP_LEVEL = 6
+
+# Most paths CloudFront accepts in one invalidation batch; beyond this the
+# whole distribution is invalidated instead
+MAX_INVALIDATION_PATHS = 3000
+
+# Response bodies with their fixed parts already encoded; only the bucket
+# name or error message is JSON-encoded per invocation
+SUCCESS_BODIES = {
+    False: '{"message": "Website updated successfully", "bucket": %s, "celebrationMode": false}',
+    True: '{"message": "Celebration mode activated", "bucket": %s, "celebrationMode": true}'
+}
+ERROR_BODY = '{"message": %s}'
+
+# boto3 clients reused across warm invocations, keyed by (service, region)
+aws_clients = {}
+
+# CloudFormation stack outputs reused across warm invocations, keyed by (stack name, region)
+stack_outputs_cache = {}
+
+# Make the scripts packaged next to this handler importable, along with the
+# ovechkin_tracker module in the parent directory
+TASK_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (TASK_DIR, os.path.dirname(TASK_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Import the website generators once per container so that warm invocations
+# reuse the loaded modules
+try:
+    import update_website as update_website_module
+except Exception as e:
+    logger.error(f"Error importing update_website.py: {str(e)}")
+    update_website_module = None
+
+try:
+    import celebrate as celebrate_module
+except Exception as e:
+    logger.error(f"Error importing celebrate.py: {str(e)}")
+    celebrate_module = None
+
+# Large files are uploaded in parallel 8 MB parts
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=20,
+    use_threads=True
+)
+
+# Multipart uploads get an ETag that isn't the file's MD5, so large files have
+# their MD5 stored in this user metadata key (x-amz-meta-content-md5) instead
+MD5_METADATA_KEY = 'content-md5'
+
+def get_client(service, region=None):
+    """Get a boto3 client for the service, creating it on first use"""
+    key = (service, region)
+    if key not in aws_clients:
+        aws_clients[key] = boto3.client(service, region_name=region, config=AWS_CONFIG)
+    return aws_clients[key]
+
+@functools.lru_cache(maxsize=32)
+def fetch_parameter(name):
+    """Fetch a parameter from SSM Parameter Store, caching it for the life of the container"""
+    response = get_client('ssm').get_parameter(Name=name, WithDecryption=True)
+    return response['Parameter']['Value']
+
 def get_parameter(name):
     """Get a parameter from SSM Parameter Store"""
     try:
-        ssm = boto3.client('ssm')
-        response = ssm.get_parameter(Name=name, WithDecryption=True)
-        return response['Parameter']['Value']
+        return fetch_parameter(name)
     except Exception as e:
         logger.warning(f"Could not retrieve parameter {name}: {e}")
         return None
 
+def get_stack_outputs(stack_name, region):
+    """
+    Get the outputs of a CloudFormation stack, describing the stack only once per container
+    
+    Args:
+        stack_name: Name of the stack
+        region: AWS region of the stack
+        
+    Returns:
+        dict: Output key -> output value
+    """
+    key = (stack_name, region)
+    if key not in stack_outputs_cache:
+        response = get_client('cloudformation', region).describe_stacks(StackName=stack_name)
+        stack_outputs_cache[key] = {
+            output['OutputKey']: output['OutputValue'] for output in response['Stacks'][0]['Outputs']
+        }
+    return stack_outputs_cache[key]
+
 def lambda_handler(event, context):
     """
     Lambda handler function that executes the update_website.py script
@@ -60,62 +176,30 @@ def lambda_handler(event, context):
         
         logger.info(f"Using AWS region: {region}")
         
-        # Get the S3 bucket name from CloudFormation outputs
-        cf_client = boto3.client('cloudformation', region_name=region)
-        response = cf_client.describe_stacks(StackName=stack_name)
-        
-        bucket_name = None
-        for output in response['Stacks'][0]['Outputs']:
-            if output['OutputKey'] == 'WebsiteBucketName':
-                bucket_name = output['OutputValue']
-                break
-        
-        if not bucket_name:
-            raise Exception(f"Could not find WebsiteBucketName in stack {stack_name} outputs")
+        # Look up the CloudFormation outputs in the background while the site is generated
+        executor = ThreadPoolExecutor(max_workers=1)
+        outputs_future = executor.submit(get_stack_outputs, stack_name, region)
+        executor.shutdown(wait=False)
         
-        logger.info(f"Target S3 bucket: {bucket_name}")
-        
-        # Set up the Python path for imports
-        # First, add the Lambda task directory to the path
-        task_dir = os.path.dirname(os.path.abspath(__file__))
-        if task_dir not in sys.path:
-            sys.path.insert(0, task_dir)
-        
-        # Add the parent directory to the path for the ovechkin_tracker module
-        parent_dir = os.path.dirname(task_dir)
-        if parent_dir not in sys.path:
-            sys.path.insert(0, parent_dir)
-            
-        # Print the sys.path for debugging
-        logger.info(f"Python sys.path: {sys.path}")
+        # Check if assets directory exists and log its location
+        assets_dir = os.path.join(TASK_DIR, "assets")
+        if os.path.exists(assets_dir):
+            logger.info(f"Assets directory found at: {assets_dir}")
+        else:
+            logger.warning(f"Assets directory not found at: {assets_dir}")
         
-        # List directories to debug
-        logger.info(f"Contents of task_dir: {os.listdir(task_dir)}")
+        # Directory listings are only gathered when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Python sys.path: %s", sys.path)
+            logger.debug("Contents of task_dir: %s", os.listdir(TASK_DIR))
+            if os.path.exists(assets_dir):
+                logger.debug("Assets directory contents: %s", os.listdir(assets_dir))
         
-        # Import the appropriate module based on celebration mode
+        # Run the appropriate module based on celebration mode
         if celebrate:
             try:
-                # Try to import the celebrate module
-                celebrate_path = os.path.join(task_dir, "celebrate.py")
-                logger.info(f"Importing celebrate from: {celebrate_path}")
-                
-                if not os.path.exists(celebrate_path):
-                    raise FileNotFoundError(f"celebrate.py not found at {celebrate_path}")
-                    
-                # Check if assets directory exists and log its location
-                assets_dir = os.path.join(task_dir, "assets")
-                if os.path.exists(assets_dir):
-                    logger.info(f"Assets directory found at: {assets_dir}")
-                    logger.info(f"Assets directory contents: {os.listdir(assets_dir)}")
-                else:
-                    logger.warning(f"Assets directory not found at: {assets_dir}")
-                    
-                spec = importlib.util.spec_from_file_location(
-                    "celebrate", 
-                    celebrate_path
-                )
-                celebrate_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(celebrate_module)
+                if celebrate_module is None:
+                    raise ImportError(f"celebrate.py could not be imported from {TASK_DIR}")
                 
                 # Call the update_website function from the celebrate module
                 logger.info("Executing celebration update_website function")
@@ -126,29 +210,9 @@ def lambda_handler(event, context):
                 logger.error(f"Error importing or executing celebrate.py: {str(e)}")
                 raise
         else:
-            # Import the update_website function directly
             try:
-                # Try to import the update_website module
-                update_website_path = os.path.join(task_dir, "update_website.py")
-                logger.info(f"Importing update_website from: {update_website_path}")
-                
-                if not os.path.exists(update_website_path):
-                    raise FileNotFoundError(f"update_website.py not found at {update_website_path}")
-                    
-                # Check if assets directory exists and log its location
-                assets_dir = os.path.join(task_dir, "assets")
-                if os.path.exists(assets_dir):
-                    logger.info(f"Assets directory found at: {assets_dir}")
-                    logger.info(f"Assets directory contents: {os.listdir(assets_dir)}")
-                else:
-                    logger.warning(f"Assets directory not found at: {assets_dir}")
-                    
-                spec = importlib.util.spec_from_file_location(
-                    "update_website", 
-                    update_website_path
-                )
-                update_website_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(update_website_module)
+                if update_website_module is None:
+                    raise ImportError(f"update_website.py could not be imported from {TASK_DIR}")
                 
                 # Call the update_website function
                 logger.info("Executing update_website function")
@@ -159,18 +223,27 @@ def lambda_handler(event, context):
                 logger.error(f"Error importing or executing update_website.py: {str(e)}")
                 raise
         
+        # Get the S3 bucket name from CloudFormation outputs
+        outputs = outputs_future.result()
+        
+        bucket_name = outputs.get('WebsiteBucketName')
+        if not bucket_name:
+            raise Exception(f"Could not find WebsiteBucketName in stack {stack_name} outputs")
+        
+        logger.info(f"Target S3 bucket: {bucket_name}")
+        
         # Get the updated static files
         # In Lambda, the files will be in /tmp/static instead of task_dir/static
         static_dir = '/tmp/static'
         if not os.path.exists(static_dir):
             logger.warning(f"Temporary static directory not found at {static_dir}")
             # Try alternative locations
-            alt_static_dir = os.path.join(task_dir, 'static')
+            alt_static_dir = os.path.join(TASK_DIR, 'static')
             if os.path.exists(alt_static_dir):
                 static_dir = alt_static_dir
                 logger.info(f"Using alternative static directory: {static_dir}")
             else:
-                alt_static_dir = os.path.join(os.path.dirname(task_dir), 'static')
+                alt_static_dir = os.path.join(os.path.dirname(TASK_DIR), 'static')
                 if os.path.exists(alt_static_dir):
                     static_dir = alt_static_dir
                     logger.info(f"Using alternative static directory: {static_dir}")
@@ -178,67 +251,185 @@ def lambda_handler(event, context):
                     raise Exception(f"Static directory not found at {static_dir} or any alternative locations")
         
         logger.info(f"Using static directory: {static_dir}")
-        logger.info(f"Static directory contents: {os.listdir(static_dir)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Static directory contents: %s", os.listdir(static_dir))
         
         # Upload the updated content to S3
-        s3_client = boto3.client('s3', region_name=region)
+        s3_client = get_client('s3', region)
         
         logger.info(f"Uploading content from {static_dir} to S3 bucket {bucket_name}")
-        for root, _, files in os.walk(static_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                s3_key = os.path.relpath(file_path, static_dir)
-                
-                logger.info(f"Uploading {file_path} to s3://{bucket_name}/{s3_key}")
-                s3_client.upload_file(
-                    Filename=file_path,
-                    Bucket=bucket_name,
-                    Key=s3_key,
-                    ExtraArgs={'ContentType': get_content_type(file_path)}
-                )
+        changed_keys = upload_static_files(s3_client, bucket_name, static_dir)
+        logger.info(f"Uploaded {len(changed_keys)} changed files")
         
         # Invalidate CloudFront cache if distribution exists
         try:
             # Get CloudFront distribution ID
-            for output in response['Stacks'][0]['Outputs']:
-                if output['OutputKey'] == 'CloudFrontDistributionId':
-                    distribution_id = output['OutputValue']
-                    
-                    # Create CloudFront invalidation
-                    cf_client = boto3.client('cloudfront', region_name=region)
-                    cf_client.create_invalidation(
-                        DistributionId=distribution_id,
-                        InvalidationBatch={
-                            'Paths': {
-                                'Quantity': 1,
-                                'Items': ['/*']
-                            },
-                            'CallerReference': str(context.aws_request_id)
-                        }
-                    )
-                    logger.info(f"Created CloudFront invalidation for distribution {distribution_id}")
-                    break
+            distribution_id = outputs.get('CloudFrontDistributionId')
+            if distribution_id and not changed_keys:
+                logger.info("No files changed, skipping CloudFront invalidation")
+            elif distribution_id:
+                # Create CloudFront invalidation for the files that changed
+                paths = get_invalidation_paths(changed_keys)
+                # CloudFront is a global service, so one client serves every region
+                cf_client = get_client('cloudfront')
+                cf_client.create_invalidation(
+                    DistributionId=distribution_id,
+                    InvalidationBatch={
+                        'Paths': {
+                            'Quantity': len(paths),
+                            'Items': paths
+                        },
+                        'CallerReference': str(context.aws_request_id)
+                    }
+                )
+                logger.info(f"Created CloudFront invalidation of {len(paths)} paths for distribution {distribution_id}")
         except Exception as e:
             logger.warning(f"Could not invalidate CloudFront cache: {str(e)}")
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Celebration mode activated' if celebrate else 'Website updated successfully',
-                'bucket': bucket_name,
-                'celebrationMode': celebrate
-            })
+            'body': SUCCESS_BODIES[bool(celebrate)] % json.dumps(bucket_name)
         }
         
     except Exception as e:
         logger.error(f"Error updating website: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
-                'message': f'Error updating website: {str(e)}'
-            })
+            'body': ERROR_BODY % json.dumps(f'Error updating website: {str(e)}')
         }
 
+def iter_static_files(directory, prefix=''):
+    """
+    Walk a directory tree with os.scandir, building S3 keys as it goes
+    
+    Args:
+        directory: Directory to walk
+        prefix: S3 key prefix of the directory's entries
+        
+    Yields:
+        tuple: (file path, S3 key) for every file in the tree
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from iter_static_files(entry.path, prefix + entry.name + '/')
+            else:
+                yield entry.path, prefix + entry.name
+
+def list_bucket_etags(s3_client, bucket_name):
+    """
+    Get the ETag of every object in the bucket
+    
+    Args:
+        s3_client: boto3 S3 client
+        bucket_name: Name of the bucket
+        
+    Returns:
+        dict: S3 key -> ETag without quotes, empty if the bucket can't be listed
+    """
+    etags = {}
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name):
+            for obj in page.get('Contents', []):
+                etags[obj['Key']] = obj['ETag'].strip('"')
+    except Exception as e:
+        logger.warning(f"Could not list bucket {bucket_name}, uploading every file: {str(e)}")
+        return {}
+    return etags
+
+def file_md5(file_path):
+    """Get the hex MD5 of a file, which is the ETag S3 gives single-part uploads"""
+    # file_digest hashes through a fixed-size buffer instead of reading the whole file
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'md5').hexdigest()
+
+def get_stored_md5(s3_client, bucket_name, s3_key):
+    """Get the MD5 recorded in an object's metadata when it was uploaded, or None if there isn't one"""
+    try:
+        response = s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+    except Exception as e:
+        logger.warning(f"Could not read metadata of s3://{bucket_name}/{s3_key}: {str(e)}")
+        return None
+    return response.get('Metadata', {}).get(MD5_METADATA_KEY)
+
+def upload_static_files(s3_client, bucket_name, static_dir):
+    """
+    Upload the files under static_dir that differ from the bucket, several files at a time
+    
+    Args:
+        s3_client: boto3 S3 client (safe to share between threads)
+        bucket_name: Name of the target bucket
+        static_dir: Directory whose contents mirror the bucket
+        
+    Returns:
+        list: S3 keys that were uploaded
+    """
+    uploads = list(iter_static_files(static_dir))
+    
+    # Files whose MD5 matches the current ETag (or, for multipart uploads, the
+    # MD5 stored in the object's metadata) are already up to date
+    etags = list_bucket_etags(s3_client, bucket_name)
+    
+    # One transfer manager shared by all threads handles multipart uploads
+    transfer = S3Transfer(s3_client, TRANSFER_CONFIG)
+    
+    def upload(task):
+        file_path, s3_key = task
+        content_type = get_content_type(file_path)
+        
+        # Small files are read once into memory, hashed and sent with a single
+        # PutObject; large ones go through the multipart transfer manager
+        if os.path.getsize(file_path) < TRANSFER_CONFIG.multipart_threshold:
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            extra_args = {'ContentType': content_type}
+            if file_path.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                # A fixed mtime keeps the compressed bytes, and so the ETag, stable
+                body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+                extra_args['ContentEncoding'] = 'gzip'
+            if etags.get(s3_key) == hashlib.md5(body).hexdigest():
+                logger.info(f"Skipping unchanged s3://{bucket_name}/{s3_key}")
+                return None
+            logger.info(f"Uploading {file_path} to s3://{bucket_name}/{s3_key}")
+            s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=body, **extra_args)
+            return s3_key
+        
+        md5 = file_md5(file_path)
+        etag = etags.get(s3_key)
+        if etag and (etag == md5 or ('-' in etag and get_stored_md5(s3_client, bucket_name, s3_key) == md5)):
+            logger.info(f"Skipping unchanged s3://{bucket_name}/{s3_key}")
+            return None
+        logger.info(f"Uploading {file_path} to s3://{bucket_name}/{s3_key}")
+        transfer.upload_file(
+            file_path,
+            bucket_name,
+            s3_key,
+            extra_args={'ContentType': content_type, 'Metadata': {MD5_METADATA_KEY: md5}}
+        )
+        return s3_key
+    
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        return [s3_key for s3_key in executor.map(upload, uploads) if s3_key]
+
+def get_invalidation_paths(changed_keys):
+    """
+    Get the CloudFront paths to invalidate for the uploaded keys
+    
+    Args:
+        changed_keys: S3 keys that were uploaded
+        
+    Returns:
+        list: One path per key, or just '/*' when there are too many for one batch
+    """
+    paths = ['/' + s3_key for s3_key in changed_keys]
+    # The site root is served from index.html, so it is cached under '/' too
+    if 'index.html' in changed_keys:
+        paths.append('/')
+    if len(paths) > MAX_INVALIDATION_PATHS:
+        return ['/*']
+    return paths
+
 def get_content_type(file_path):
     """
     Determine the content type based on file extension
@@ -250,17 +441,4 @@ def get_content_type(file_path):
         str: Content type for the file
     """
     extension = os.path.splitext(file_path)[1].lower()
-    content_types = {
-        '.html': 'text/html',
-        '.css': 'text/css',
-        '.js': 'application/javascript',
-        '.json': 'application/json',
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif',
-        '.svg': 'image/svg+xml',
-        '.ico': 'image/x-icon'
-    }
-    
-    return content_types.get(extension, 'application/octet-stream')
+    return CONTENT_TYPES.get(extension, 'application/octet-stream')
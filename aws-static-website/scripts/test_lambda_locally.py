@@ -28,10 +28,10 @@ def check_dependencies():
     missing = []
     
     for package in required:
-        try:
-            __import__(package)
+        # find_spec locates the package without running its import
+        if importlib.util.find_spec(package) is not None:
             logger.info(f"\u2705 Package {package} is installed")
-        except ImportError:
+        else:
             logger.error(f"\u274c Package {package} is NOT installed")
             missing.append(package)
     
@@ -123,6 +123,18 @@ def test_update_website():
         logger.error(f"Error testing update_website: {str(e)}")
         return False
 
+def link_into(src, dest):
+    """
+    Symlink src to dest, copying it instead where symlinks aren't supported
+    """
+    try:
+        os.symlink(src, dest, target_is_directory=os.path.isdir(src))
+    except OSError:
+        if os.path.isdir(src):
+            shutil.copytree(src, dest)
+        else:
+            shutil.copy2(src, dest)
+
 def simulate_lambda_handler():
     """
     Simulate the Lambda handler function locally
@@ -153,20 +165,20 @@ def simulate_lambda_handler():
                 logger.error(f"\u274c update_website.py not found at {update_website_path}")
                 return False
             
-            # Copy necessary files to the temp directory
-            shutil.copy2(lambda_file, os.path.join(temp_dir, "update_website_lambda.py"))
-            shutil.copy2(update_website_path, os.path.join(temp_dir, "update_website.py"))
+            # Link necessary files into the temp directory
+            link_into(lambda_file, os.path.join(temp_dir, "update_website_lambda.py"))
+            link_into(update_website_path, os.path.join(temp_dir, "update_website.py"))
             
             # Create static directory in temp dir
             static_dir = os.path.join(temp_dir, "static")
             os.makedirs(static_dir, exist_ok=True)
             
-            # Copy ovechkin_tracker module
+            # Link ovechkin_tracker module
             ovechkin_tracker_src = os.path.join(project_root, "ovechkin_tracker")
             ovechkin_tracker_dest = os.path.join(temp_dir, "ovechkin_tracker")
             if os.path.exists(ovechkin_tracker_src):
-                shutil.copytree(ovechkin_tracker_src, ovechkin_tracker_dest)
-                logger.info(f"\u2705 Copied ovechkin_tracker module to {ovechkin_tracker_dest}")
+                link_into(ovechkin_tracker_src, ovechkin_tracker_dest)
+                logger.info(f"\u2705 Linked ovechkin_tracker module to {ovechkin_tracker_dest}")
             else:
                 logger.error(f"\u274c ovechkin_tracker module not found at {ovechkin_tracker_src}")
                 return False
@@ -9,8 +9,6 @@ Ovechkin stats data, similar to what is sent in the email notifications.
 import os
 import logging
 import pytz
-import subprocess
-import json
 from datetime import datetime
 import sys
 import shutil
@@ -19,73 +17,24 @@ import shutil
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Get the directory of this script and the project root above it
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 
-def generate_html_content(stats):
-    """
-    Generate HTML content for the static website based on Ovechkin stats
-    
-    Args:
-        stats: Dictionary containing Ovechkin's stats
-        
-    Returns:
-        str: HTML content for the website
-    """
-    # Import required modules
-    from datetime import datetime
-    import re
-    
-    # Extract key information
-    total_goals = stats.get('flat_stats', {}).get('Total Number of Goals', 'N/A')
-    goals_needed = stats.get('flat_stats', {}).get('Goals to Beat Gretzy', 'N/A')
-    
-    # Hard-code the record-breaking game date to Sunday, April 6, 2025
-    formatted_projection = "Record-Breaking Game: Sunday, April 6, 2025"
-    
-    # Get the projected game dictionary from nested stats which has structured data
-    projected_game_dict = stats.get('nested_stats', {}).get('record', {}).get('projected_game', {})
-    
-    # Add time if available
-    if projected_game_dict and 'time' in projected_game_dict:
-        game_time = projected_game_dict['time']
-        if game_time:
-            formatted_projection += f", {game_time}"
-    else:
-        # Default time if not available
-        formatted_projection += ", 12:30 PM ET"
-    
-    # Add team and location
-    if projected_game_dict:
-        team = projected_game_dict.get('opponent', '').split(',')[0].strip()
-        location = projected_game_dict.get('location', '')
-        
-        if team:
-            formatted_projection += f" vs {team}"
-            if location:
-                # Make sure location is properly formatted with parentheses
-                if location.startswith('(') and location.endswith(')'):
-                    formatted_projection += f" {location}"
-                else:
-                    formatted_projection += f" ({location})"
-        else:
-            # Default opponent and location if not available
-            formatted_projection += " vs New York Islanders (Away)"
-    else:
-        # Default opponent and location if no projected game dictionary
-        formatted_projection += " vs New York Islanders (Away)"
-    
-    # Calculate progress percentage
-    try:
-        progress_pct = round((int(total_goals) / 894) * 100, 1)
-        progress_pct_str = str(progress_pct)
-    except (ValueError, ZeroDivisionError):
-        progress_pct = 0
-        progress_pct_str = "0"
-    
-    # Current time in ET for the footer
-    current_time = datetime.now(pytz.timezone('America/New_York')).strftime('%Y-%m-%d %I:%M:%S %p ET')
-    
-    # Create HTML content with Washington Capitals colors and responsive design
-    html = f"""<!DOCTYPE html>
+# Import OvechkinData in-process, adding the project root to the path so the
+# package is found without spawning a separate python3 process
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+try:
+    from ovechkin_tracker.ovechkin_data import OvechkinData
+except ImportError as e:
+    logger.warning(f"Import of OvechkinData failed: {str(e)}")
+    OvechkinData = None
+
+
+# Page template with Washington Capitals colors and responsive design, built
+# once at import and filled in with str.format_map (CSS braces are doubled)
+HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <!-- Meta tags for proper responsive behavior and character encoding -->
@@ -856,6 +805,67 @@ def generate_html_content(stats):
 </body>
 </html>
 """
+
+
+def generate_html_content(stats):
+    """
+    Generate HTML content for the static website based on Ovechkin stats
+    
+    Args:
+        stats: Dictionary containing Ovechkin's stats
+        
+    Returns:
+        str: HTML content for the website
+    """
+    # Extract key information
+    total_goals = stats.get('flat_stats', {}).get('Total Number of Goals', 'N/A')
+    goals_needed = stats.get('flat_stats', {}).get('Goals to Beat Gretzy', 'N/A')
+    
+    # Hard-code the record-breaking game date to Sunday, April 6, 2025
+    formatted_projection = "Record-Breaking Game: Sunday, April 6, 2025"
+    
+    # Get the projected game dictionary from nested stats which has structured data
+    projected_game_dict = stats.get('nested_stats', {}).get('record', {}).get('projected_game', {})
+    
+    # Add time if available
+    if projected_game_dict and 'time' in projected_game_dict:
+        game_time = projected_game_dict['time']
+        if game_time:
+            formatted_projection += f", {game_time}"
+    else:
+        # Default time if not available
+        formatted_projection += ", 12:30 PM ET"
+    
+    # Add team and location
+    if projected_game_dict:
+        team = projected_game_dict.get('opponent', '').split(',')[0].strip()
+        location = projected_game_dict.get('location', '')
+        
+        if team:
+            formatted_projection += f" vs {team}"
+            if location:
+                # Make sure location is properly formatted with parentheses
+                if location.startswith('(') and location.endswith(')'):
+                    formatted_projection += f" {location}"
+                else:
+                    formatted_projection += f" ({location})"
+        else:
+            # Default opponent and location if not available
+            formatted_projection += " vs New York Islanders (Away)"
+    else:
+        # Default opponent and location if no projected game dictionary
+        formatted_projection += " vs New York Islanders (Away)"
+    
+    # Current time in ET for the footer
+    current_time = datetime.now(pytz.timezone('America/New_York')).strftime('%Y-%m-%d %I:%M:%S %p ET')
+    
+    # Fill in the page template
+    html = HTML_TEMPLATE.format_map({
+        'total_goals': total_goals,
+        'goals_needed': goals_needed,
+        'formatted_projection': formatted_projection,
+        'current_time': current_time,
+    })
     
     return html
 
@@ -868,38 +878,16 @@ def update_website():
         bool: True if website was updated successfully, False otherwise
     """
     try:
-        # Get the project root directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        
         # Check if running in Lambda environment
         is_lambda = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
         
-        # Try different approaches to get the Ovechkin stats
-        # First, try direct import if the module is in the path
-        try:
-            logger.info("Attempting direct import of OvechkinData...")
-            # Add project root to path if not already there
-            if project_root not in sys.path and os.path.exists(os.path.join(project_root, 'ovechkin_tracker')):
-                sys.path.insert(0, project_root)
-                
-            # Try direct import
-            from ovechkin_tracker.ovechkin_data import OvechkinData
-            stats = OvechkinData().get_all_stats()
-            logger.info("Successfully imported OvechkinData directly")
-        except ImportError as e:
-            logger.warning(f"Direct import failed: {str(e)}. Trying subprocess approach...")
-            # Fallback to subprocess approach for local environment
-            cmd = [
-                'python3', '-c',
-                'from ovechkin_tracker.ovechkin_data import OvechkinData; import json; stats = OvechkinData().get_all_stats(); print(json.dumps(stats))'
-            ]
-            
-            # Run the command from the project root to ensure proper imports
-            result = subprocess.run(cmd, cwd=project_root, capture_output=True, text=True, check=True)
-            
-            # Parse the JSON output
-            stats = json.loads(result.stdout)
+        if OvechkinData is None:
+            error_msg = "ERROR: Failed to get Ovechkin stats: ovechkin_tracker could not be imported"
+            logger.error(error_msg)
+            print(error_msg)
+            return False
+        
+        stats = OvechkinData().get_all_stats()
         
         if 'error' in stats:
             error_msg = f"ERROR: Failed to calculate stats: {stats['error']}"
@@ -917,7 +905,7 @@ def update_website():
             index_path = os.path.join(static_dir, 'index.html')
             logger.info(f"Running in Lambda environment, using temp directory: {static_dir}")
         else:
-            static_dir = os.path.join(script_dir, 'static')
+            static_dir = os.path.join(SCRIPT_DIR, 'static')
             index_path = os.path.join(static_dir, 'index.html')
             logger.info(f"Running in local environment, using directory: {static_dir}")
         
@@ -929,7 +917,7 @@ def update_website():
         os.makedirs(assets_dir, exist_ok=True)
         
         # Copy the gr8.svg file to the assets directory
-        source_svg = os.path.join(script_dir, 'assets', 'gr8.svg')
+        source_svg = os.path.join(SCRIPT_DIR, 'assets', 'gr8.svg')
         target_svg = os.path.join(assets_dir, 'gr8.svg')
         
         if os.path.exists(source_svg):
@@ -948,11 +936,6 @@ def update_website():
         print(success_msg)
         return True
         
-    except subprocess.CalledProcessError as e:
-        error_msg = f"ERROR: Failed to get Ovechkin stats: {e.stderr}"
-        logger.error(error_msg)
-        print(error_msg)
-        return False
     except Exception as e:
         error_msg = f"ERROR: Failed to update website: {str(e)}"
         logger.error(error_msg)
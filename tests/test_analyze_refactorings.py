@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Tests for the Refactoring Analysis Script
+
+This module tests the GPT-powered refactoring analysis script using a mocked
+OpenAI client so that no API calls are made.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import openai
+import pytest
+import tenacity
+from unittest.mock import AsyncMock, MagicMock
+import importlib.util
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import the script using importlib since it lives outside of a package
+scripts_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.github', 'scripts')
+script_file = os.path.join(scripts_dir, 'analyze_refactorings.py')
+spec = importlib.util.spec_from_file_location('analyze_refactorings', script_file)
+analyze_refactorings = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(analyze_refactorings)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the analysis cache inside a temporary directory"""
+    directory = tmp_path / 'cache'
+    monkeypatch.setattr(analyze_refactorings, 'CACHE_DIR', str(directory))
+    monkeypatch.setattr(analyze_refactorings, 'MANIFEST_PATH', str(tmp_path / 'manifest.json'))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    """Use the character-based token estimate so tests never download tiktoken encodings"""
+    monkeypatch.setattr(analyze_refactorings, 'get_token_encoding', lambda: None)
+
+
+async def make_stream(content, chunk_size=8):
+    """Yield the given content as streamed chat completion chunks"""
+    for start in range(0, len(content), chunk_size):
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = content[start:start + chunk_size]
+        yield chunk
+
+
+def make_client(content="## Refactoring\nSeverity: Low"):
+    """Create a mock async OpenAI client streaming the given content"""
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: make_stream(content))
+    return client
+
+
+class TestFindPythonFiles:
+    """Test cases for discovering the files to analyze"""
+
+    def test_find_python_files_prunes_excluded_directories(self, tmp_path, monkeypatch):
+        """Test that excluded and hidden directories are skipped"""
+        for relative in ('main.py', 'pkg/module.py', 'pkg/notes.txt', 'venv/lib/site.py',
+                         '.git/hooks/hook.py', '.github/scripts/script.py', 'pkg/__pycache__/module.py',
+                         'node_modules/tool/build.py'):
+            path = tmp_path / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n")
+        monkeypatch.chdir(tmp_path)
+
+        files = analyze_refactorings.find_python_files()
+
+        assert files == ['main.py', os.path.join('pkg', 'module.py')]
+
+
+class TestAnalyzeFiles:
+    """Test cases for the concurrent analysis of files"""
+
+    def test_analyze_files_batches_small_files(self, tmp_path):
+        """Test that small files share one request and results line up with the input paths"""
+        paths = []
+        for name in ('a.py', 'b.py', 'c.py'):
+            path = tmp_path / name
+            path.write_text(f"def {name[0]}():\n    return 1\n")
+            paths.append(str(path))
+
+        client = make_client(json.dumps({path: f"Analysis of {path}" for path in paths}))
+        results = asyncio.run(analyze_refactorings.analyze_files(client, paths))
+
+        assert results == [f"Analysis of {path}" for path in paths]
+        assert client.chat.completions.create.await_count == 1
+        request = client.chat.completions.create.await_args.kwargs
+        assert request['response_format'] == {"type": "json_object"}
+        assert request['messages'][0]['content'] == analyze_refactorings.BATCH_SYSTEM_PROMPT
+        assert request['max_tokens'] == 3 * analyze_refactorings.MAX_RESPONSE_TOKENS
+
+    def test_unparseable_batch_falls_back_to_single_requests(self, tmp_path):
+        """Test that each file is analyzed on its own when the batch response is not JSON"""
+        paths = []
+        for name in ('a.py', 'b.py'):
+            path = tmp_path / name
+            path.write_text(f"{name[0]} = 1\n")
+            paths.append(str(path))
+
+        client = make_client("## Refactoring\nSeverity: Low")
+        results = asyncio.run(analyze_refactorings.analyze_files(client, paths))
+
+        assert results == ["## Refactoring\nSeverity: Low"] * 2
+        assert client.chat.completions.create.await_count == 3
+
+    def test_identical_files_are_analyzed_once(self, tmp_path):
+        """Test that files with the same content share a single analysis"""
+        paths = []
+        for name in ('a.py', 'b.py', 'c.py'):
+            path = tmp_path / name
+            path.write_text("x = 1\n")
+            paths.append(str(path))
+
+        client = make_client()
+        results = asyncio.run(analyze_refactorings.analyze_files(client, paths))
+
+        assert results == ["## Refactoring\nSeverity: Low"] * 3
+        assert client.chat.completions.create.await_count == 1
+
+    def test_pack_batches_respects_limits(self, monkeypatch):
+        """Test that batches stay within the file count and size limits"""
+        monkeypatch.setattr(analyze_refactorings, 'BATCH_MAX_FILES', 2)
+        files = [('big.py', 'x' * 5000)] + [(f'{i}.py', 'x' * 100) for i in range(3)]
+
+        batches = analyze_refactorings.pack_batches(files)
+
+        assert sorted(len(batch) for batch in batches) == [1, 1, 2]
+        assert [('big.py', 'x' * 5000)] in batches
+
+    def test_analyze_files_skips_empty_files(self, tmp_path):
+        """Test that empty files are not sent to the API"""
+        empty = tmp_path / 'empty.py'
+        empty.write_text("   \n")
+
+        client = make_client()
+        results = asyncio.run(analyze_refactorings.analyze_files(client, [str(empty)]))
+
+        assert results == [None]
+        client.chat.completions.create.assert_not_awaited()
+
+
+class TestLargeFiles:
+    """Test cases for files that do not fit within the prompt budget"""
+
+    def test_split_code_keeps_definitions_whole(self):
+        """Test that chunks break between top-level definitions and cover every line"""
+        code = "".join(f"@decorator\ndef function_{i}():\n    return {i}\n\n" for i in range(6))
+
+        chunks = analyze_refactorings.split_code(code, 20)
+
+        assert len(chunks) > 1
+        assert "".join(chunk for _, _, chunk in chunks) == code
+        for first_line, last_line, chunk in chunks:
+            assert chunk.startswith("@decorator\n")
+            assert chunk.count("\n") == last_line - first_line + 1
+
+    def test_split_code_splits_oversized_definitions_by_line(self):
+        """Test that a single definition larger than the budget is still split"""
+        code = "def big():\n" + "".join(f"    x_{i} = {i}\n" for i in range(50))
+
+        chunks = analyze_refactorings.split_code(code, 20)
+
+        assert len(chunks) > 1
+        assert "".join(chunk for _, _, chunk in chunks) == code
+
+    def test_large_file_is_analyzed_in_chunks(self, tmp_path, monkeypatch):
+        """Test that a file over MAX_INPUT_TOKENS is sent as several smaller requests"""
+        monkeypatch.setattr(analyze_refactorings, 'MAX_INPUT_TOKENS', 400)
+        code = "".join(f"def function_{i}():\n    return {i}\n\n" for i in range(100))
+
+        client = make_client()
+        analysis = asyncio.run(analyze_refactorings.analyze_code(client, 'big.py', code, use_cache=False))
+
+        assert client.chat.completions.create.await_count > 1
+        assert analysis.startswith("## Lines 1-")
+        for call in client.chat.completions.create.await_args_list:
+            prompt = "".join(message['content'] for message in call.kwargs['messages'])
+            assert analyze_refactorings.estimate_tokens(prompt) <= 400
+
+
+    def test_chunk_requests_share_the_concurrency_limit(self, monkeypatch):
+        """Test that the chunks of a large file never have more requests in flight than the semaphore allows"""
+        monkeypatch.setattr(analyze_refactorings, 'MAX_INPUT_TOKENS', 400)
+        code = "".join(f"def function_{i}():\n    return {i}\n\n" for i in range(100))
+        in_flight = []
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal peak
+            in_flight.append(kwargs)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return make_stream("## Refactoring")
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+
+        async def run():
+            semaphore = asyncio.Semaphore(2)
+            return await analyze_refactorings.analyze_code(client, 'big.py', code, use_cache=False, semaphore=semaphore)
+
+        asyncio.run(run())
+
+        assert client.chat.completions.create.await_count > 2
+        assert peak == 2
+
+
+class TestRequestRetries:
+    """Test cases for retrying transient API errors"""
+
+    @staticmethod
+    def make_error(error_class, status_code):
+        """Build an OpenAI API error with a fake HTTP response"""
+        return error_class("error", response=MagicMock(status_code=status_code), body=None)
+
+    def test_rate_limit_errors_are_retried(self):
+        """Test that a rate-limited request is retried until it succeeds"""
+        client = make_client()
+        client.chat.completions.create.side_effect = [
+            self.make_error(openai.RateLimitError, 429),
+            make_stream("## Refactoring\nSeverity: Low"),
+        ]
+        request = analyze_refactorings.request_analysis.retry_with(wait=tenacity.wait_none())
+
+        result = asyncio.run(request(client, "code", 100))
+
+        assert result == "## Refactoring\nSeverity: Low"
+        assert client.chat.completions.create.await_count == 2
+        assert client.chat.completions.create.await_args.kwargs['stream'] is True
+
+    def test_bad_request_errors_are_not_retried(self):
+        """Test that a bad request fails immediately"""
+        client = make_client()
+        client.chat.completions.create.side_effect = self.make_error(openai.BadRequestError, 400)
+        request = analyze_refactorings.request_analysis.retry_with(wait=tenacity.wait_none())
+
+        with pytest.raises(openai.BadRequestError):
+            asyncio.run(request(client, "code", 100))
+        assert client.chat.completions.create.await_count == 1
+
+
+class TestAnalysisCache:
+    """Test cases for the on-disk analysis cache"""
+
+    def test_cached_analysis_skips_api_call(self, tmp_path):
+        """Test that a second run over unchanged content is served from the cache"""
+        path = tmp_path / 'module.py'
+        path.write_text("x = 1\n")
+
+        client = make_client()
+        first = asyncio.run(analyze_refactorings.analyze_file(client, str(path)))
+        second = asyncio.run(analyze_refactorings.analyze_file(client, str(path)))
+
+        assert first == second
+        assert client.chat.completions.create.await_count == 1
+
+    def test_no_cache_calls_api_every_time(self, tmp_path):
+        """Test that use_cache=False bypasses the cache"""
+        path = tmp_path / 'module.py'
+        path.write_text("x = 1\n")
+
+        client = make_client()
+        asyncio.run(analyze_refactorings.analyze_file(client, str(path), use_cache=False))
+        asyncio.run(analyze_refactorings.analyze_file(client, str(path), use_cache=False))
+
+        assert client.chat.completions.create.await_count == 2
+
+    def test_expired_cache_entry_is_ignored(self, monkeypatch):
+        """Test that entries older than CACHE_TTL are treated as misses"""
+        key = analyze_refactorings.cache_key("x = 1\n")
+        analyze_refactorings.write_cached_analysis(key, "cached")
+        assert analyze_refactorings.read_cached_analysis(key) == "cached"
+
+        monkeypatch.setattr(analyze_refactorings, 'CACHE_TTL', -1)
+        assert analyze_refactorings.read_cached_analysis(key) is None
+
+    def test_manifest_reuses_unchanged_files_past_ttl(self, tmp_path, monkeypatch):
+        """Test that files unchanged since the last run skip the API even with an expired cache"""
+        path = tmp_path / 'module.py'
+        path.write_text("x = 1\n")
+        client = make_client()
+
+        manifest = {}
+        asyncio.run(analyze_refactorings.analyze_files(client, [str(path)], manifest=manifest))
+        assert manifest == {str(path): analyze_refactorings.cache_key("x = 1\n")}
+
+        monkeypatch.setattr(analyze_refactorings, 'CACHE_TTL', -1)
+        results = asyncio.run(analyze_refactorings.analyze_files(client, [str(path)], manifest=manifest))
+
+        assert results == ["## Refactoring\nSeverity: Low"]
+        assert client.chat.completions.create.await_count == 1
+
+    def test_cache_key_depends_on_model(self, monkeypatch):
+        """Test that changing the model invalidates cached analyses"""
+        key = analyze_refactorings.cache_key("x = 1\n")
+        monkeypatch.setattr(analyze_refactorings, 'MODEL', 'another-model')
+
+        assert analyze_refactorings.cache_key("x = 1\n") != key
+
+
+class TestRateLimiter:
+    """Test cases for the token-bucket rate limiter"""
+
+    def test_acquire_within_budget_does_not_wait(self):
+        """Test that requests within the budget are granted immediately"""
+        limiter = analyze_refactorings.RateLimiter(60, 1000)
+
+        asyncio.run(limiter.acquire(100))
+
+        assert limiter.available_requests == pytest.approx(59, abs=0.1)
+        assert limiter.available_tokens == pytest.approx(900, abs=5)
+
+    def test_acquire_caps_oversized_requests(self):
+        """Test that a request larger than the bucket is capped instead of blocking forever"""
+        limiter = analyze_refactorings.RateLimiter(60, 1000)
+
+        asyncio.run(limiter.acquire(5000))
+
+        assert limiter.available_tokens == pytest.approx(0, abs=5)
+
+
+class TestGenerateHtmlReport:
+    """Test cases for the HTML report"""
+
+    @pytest.fixture
+    def report_path(self, tmp_path, monkeypatch):
+        """Write the report into a temporary directory"""
+        output_html = tmp_path / 'report' / 'refactoring-report.html'
+        monkeypatch.setattr(analyze_refactorings, 'OUTPUT_DIR', str(output_html.parent))
+        monkeypatch.setattr(analyze_refactorings, 'OUTPUT_HTML', str(output_html))
+        monkeypatch.setattr(analyze_refactorings, 'OUTPUT_CSS', str(output_html.parent / 'report.css'))
+        monkeypatch.setattr(analyze_refactorings, 'OUTPUT_JS', str(output_html.parent / 'report.js'))
+        monkeypatch.setattr(analyze_refactorings, 'OUTPUT_JSONL', str(output_html.parent / 'reports.jsonl'))
+        return output_html
+
+    @staticmethod
+    def read_records(path):
+        """Parse a JSON lines file"""
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_report_writes_analyses_as_json_lines(self, report_path):
+        """Test that analyses are written to reports.jsonl and embedded in the report"""
+        analyses = ["Use <Extract Method>\nSeverity: High", None]
+
+        analyze_refactorings.generate_html_report(['a.py', 'b.py'], analyses)
+
+        records = self.read_records(report_path.parent / 'reports.jsonl')
+        assert records == [{'index': 0, 'path': 'a.py', 'analysis': analyses[0]}]
+        html = report_path.read_text()
+        assert '<script id="report-data" type="application/x-ndjson">' in html
+        assert 'a.py' in html
+        assert 'b.py' not in html
+
+    @pytest.mark.parametrize('analysis', [
+        "Avoid </script><script>alert(1)</script>",
+        "Avoid <!--<script> in comments & templates -->",
+    ])
+    def test_embedded_data_cannot_close_its_script_tag(self, report_path, analysis):
+        """Test that markup inside an analysis is escaped and still round-trips through JSON"""
+        analyze_refactorings.generate_html_report(['a.py'], [analysis])
+
+        html = report_path.read_text()
+        data = html.split('type="application/x-ndjson">\n')[1].split('</script>')[0]
+        assert not set('<>&') & set(data)
+        assert json.loads(data) == {'index': 0, 'path': 'a.py', 'analysis': analysis}
+
+    def test_report_links_shared_assets(self, report_path):
+        """Test that the stylesheet and script are written once next to the report"""
+        analyze_refactorings.generate_html_report(['a.py'], ["Severity: Low"])
+        css_path = report_path.parent / 'report.css'
+        modified = css_path.stat().st_mtime_ns
+        os.utime(css_path, ns=(0, 0))
+
+        analyze_refactorings.generate_html_report(['a.py'], ["Severity: Low"])
+
+        html = report_path.read_text()
+        assert '<link rel="stylesheet" href="report.css">' in html
+        assert '<script src="report.js"></script>' in html
+        assert f'<script src="{analyze_refactorings.DOMPURIFY_URL}"></script>' in html
+        assert 'DOMPurify.sanitize(' in analyze_refactorings.REPORT_JS
+        assert '<style>' not in html
+        assert (report_path.parent / 'report.js').read_text() == analyze_refactorings.REPORT_JS
+        assert css_path.stat().st_mtime_ns == 0 != modified
+
+    def test_stream_html_report_writes_sections_as_analyses_complete(self, report_path, tmp_path):
+        """Test that the streamed report contains a section for every analyzed file"""
+        paths = []
+        for name in ('a.py', 'b.py'):
+            path = tmp_path / name
+            path.write_text(f"{name[0]} = 1\n")
+            paths.append(str(path))
+        client = make_client(json.dumps({path: f"Analysis of {path}" for path in paths}))
+
+        manifest = {}
+        asyncio.run(analyze_refactorings.stream_html_report(client, paths, manifest=manifest))
+
+        records = self.read_records(report_path.parent / 'reports.jsonl')
+        assert sorted((record['index'], record['path'], record['analysis']) for record in records) == [
+            (index, path, f"Analysis of {path}") for index, path in enumerate(paths)
+        ]
+        assert report_path.read_text().rstrip().endswith('</html>')
+        assert set(manifest) == set(paths)
+
+
+class TestLoadFile:
+    """Test cases for reading files before analysis"""
+
+    def test_oversized_file_is_skipped_without_reading(self, tmp_path, monkeypatch):
+        """Test that files over MAX_FILE_SIZE are rejected from their size alone"""
+        path = tmp_path / 'big.py'
+        path.write_text("x" * 100)
+        monkeypatch.setattr(analyze_refactorings, 'MAX_FILE_SIZE', 50)
+        monkeypatch.setattr('builtins.open', MagicMock(side_effect=AssertionError("file was read")))
+
+        assert analyze_refactorings.load_file(str(path)) is None
+
+    def test_file_grown_since_sizing_is_skipped(self, tmp_path, monkeypatch):
+        """Test that the read is bounded even when the size check is out of date"""
+        path = tmp_path / 'growing.py'
+        path.write_text("x" * 100)
+        monkeypatch.setattr(analyze_refactorings, 'MAX_FILE_SIZE', 50)
+        monkeypatch.setattr(analyze_refactorings.os.path, 'getsize', lambda _: 10)
+
+        assert analyze_refactorings.load_file(str(path)) is None
+
+    def test_missing_file_returns_none(self, tmp_path):
+        """Test that unreadable files are skipped"""
+        assert analyze_refactorings.load_file(str(tmp_path / 'missing.py')) is None
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the Celebration Page Writer
+
+This module tests how aws-static-website/celebrate.py writes index.html and
+decides when an existing page can be left alone.
+"""
+
+import os
+import sys
+import pytest
+import importlib.util
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import the module using importlib since the directory name isn't a valid package name
+module_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'aws-static-website', 'celebrate.py')
+spec = importlib.util.spec_from_file_location('celebrate', module_file)
+celebrate = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(celebrate)
+
+TIMESTAMPS = ('Saturday, April 12, 2025', '2025-04-12 07:45 PM ET')
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Point the celebration page at a temporary static directory with fixed timestamps"""
+    static_dir = tmp_path / 'static'
+    monkeypatch.setattr(celebrate, 'STATIC_DIR', str(static_dir))
+    monkeypatch.setattr(celebrate, 'INDEX_PATH', str(static_dir / 'index.html'))
+    monkeypatch.setattr(celebrate, 'ASSETS_DIR', str(static_dir / 'assets'))
+    monkeypatch.setattr(celebrate, 'TARGET_SVG', str(static_dir / 'assets' / 'gr8.svg'))
+    monkeypatch.setattr(celebrate, 'SIGNATURE_PATH', str(tmp_path / 'index.html.sig'))
+    monkeypatch.setattr(celebrate, 'layout_ready', False)
+    monkeypatch.setattr(celebrate, 'celebration_timestamps', lambda: TIMESTAMPS)
+    return static_dir / 'index.html'
+
+
+class TestUpdateWebsite:
+    """Test cases for writing the celebration page"""
+
+    def test_written_page_matches_the_rendered_page(self, site):
+        """Test that index.html holds exactly the rendered page and its stat is recorded"""
+        assert celebrate.update_website() is True
+
+        assert site.read_bytes() == celebrate.render_celebration_html(*TIMESTAMPS).encode('utf-8')
+        assert not [name for name in os.listdir(site.parent) if name.endswith('.html') and name != 'index.html']
+        signature, inode, mtime_ns, size = (site.parent.parent / 'index.html.sig').read_text().split()
+        page_stat = site.stat()
+        assert signature.startswith('celebration-')
+        assert (int(inode), int(mtime_ns), int(size)) == (page_stat.st_ino, page_stat.st_mtime_ns, page_stat.st_size)
+
+    def test_unchanged_page_is_not_rewritten(self, site):
+        """Test that the write is skipped when the signature, inode, mtime and size all match"""
+        celebrate.update_website()
+        before = site.stat()
+
+        assert celebrate.update_website() is True
+
+        after = site.stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    def test_page_replaced_by_another_writer_is_rendered_again(self, site):
+        """Test that a page swapped in by something else, such as update_website.py, is replaced"""
+        celebrate.update_website()
+        other = site.parent / 'other.html'
+        other.write_text("standard page")
+        os.replace(other, site)
+
+        assert celebrate.update_website() is True
+
+        assert site.read_bytes() == celebrate.render_celebration_html(*TIMESTAMPS).encode('utf-8')
+
+    def test_new_timestamps_are_written(self, site, monkeypatch):
+        """Test that a page with a different signature is rewritten"""
+        celebrate.update_website()
+        later = ('Saturday, April 12, 2025', '2025-04-12 07:46 PM ET')
+        monkeypatch.setattr(celebrate, 'celebration_timestamps', lambda: later)
+
+        celebrate.update_website()
+
+        assert '07:46 PM ET' in site.read_text()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Tests for the Lambda copy of the website generator
+
+This module tests how aws-static-website/lambda/update_website.py formats
+the projected record-breaking game into the generated page.
+"""
+
+import os
+import sys
+import time
+import pytest
+import importlib.util
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import the module using importlib since it shares its name with aws-static-website/update_website.py
+lambda_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'aws-static-website', 'lambda')
+module_file = os.path.join(lambda_dir, 'update_website.py')
+spec = importlib.util.spec_from_file_location('lambda_update_website', module_file)
+update_website = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(update_website)
+
+
+def make_stats(projected_game=None, **flat_stats):
+    """Build a stats dictionary shaped like OvechkinData.get_all_stats()"""
+    flat = {'Total Number of Goals': 890, 'Goals to Beat Gretzy': 5}
+    flat.update(flat_stats)
+    return {
+        'flat_stats': flat,
+        'nested_stats': {'record': {'projected_game': projected_game or {}}}
+    }
+
+
+class TestParseDates:
+    """Test cases for the strptime-free date parsers"""
+
+    def test_ymd_dates(self):
+        """Test that valid YYYY-MM-DD dates parse and anything else gives None"""
+        assert update_website.parse_ymd_date('2025-04-12') == datetime(2025, 4, 12)
+        assert update_website.parse_ymd_date('2025-4-6') == datetime(2025, 4, 6)
+        assert update_website.parse_ymd_date('2025-13-45') is None
+        assert update_website.parse_ymd_date('2025-04-12extra') is None
+
+    def test_mdy_dates(self):
+        """Test that valid MM/DD/YYYY dates parse and anything else gives None"""
+        assert update_website.parse_mdy_date('04/12/2025') == datetime(2025, 4, 12)
+        assert update_website.parse_mdy_date('02/30/2025') is None
+        assert update_website.parse_mdy_date('soon') is None
+
+
+class TestProjection:
+    """Test cases for the projected game line in the generated page"""
+
+    @pytest.mark.parametrize('projected_game, expected', [
+        (
+            {'raw_date': '2025-04-12', 'time': '12:30 PM ET', 'opponent': 'Columbus Blue Jackets, OH', 'location': 'Away'},
+            "Record-Breaking Game: Saturday, April 12, 2025, 12:30 PM ET vs Columbus Blue Jackets (Away)"
+        ),
+        (
+            {'raw_date': '2025-13-45', 'date': 'Sunday, 2025-04-06 (06/04/2025)', 'opponent': 'New York Islanders', 'location': '(Home)'},
+            "Record-Breaking Game: Sunday, April 06, 2025 vs New York Islanders (Home)"
+        ),
+        (
+            {'date': 'Saturday, 2025-02-30 (x)', 'opponent': 'Team', 'location': ''},
+            "Record-Breaking Game: Saturday, 2025-02-30 vs Team"
+        ),
+    ])
+    def test_structured_projection(self, projected_game, expected):
+        """Test that the structured projected game is formatted into one line"""
+        html = update_website.generate_html_content(make_stats(projected_game))
+        assert f'"startDate": "{expected}"' in html
+
+    def test_flat_projection(self):
+        """Test that the flat stats are used when there is no structured projection"""
+        stats = make_stats(**{
+            'Projected Date of Record-Breaking Goal': '04/12/2025',
+            'Projected Record-Breaking Game': 'Sat 7:00 PM ET vs Columbus Blue Jackets (Away)',
+        })
+        html = update_website.generate_html_content(stats)
+        assert '"startDate": "Record-Breaking Game: Saturday, April 12, 2025, 7:00 PM ET vs Columbus Blue Jackets (Away)"' in html
+
+
+class TestRenderCache:
+    """Test cases for reusing the rendered page across updates"""
+
+    def test_same_stats_render_once(self):
+        """Test that unchanged stats reuse the cached page with a fresh update time"""
+        update_website.render_html.cache_clear()
+        stats = make_stats({'raw_date': '2025-04-12', 'opponent': 'Team', 'location': 'Home'})
+
+        first = update_website.generate_html_content(stats)
+        second = update_website.generate_html_content(stats)
+
+        info = update_website.render_html.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        for html in (first, second):
+            assert update_website.CURRENT_TIME_PLACEHOLDER not in html
+            assert ' ET</span>' in html
+
+
+class TestFormatGameDate:
+    """Test cases for cleaning up the projected game's date field"""
+
+    @pytest.mark.parametrize('date_str, expected', [
+        ('Saturday, 2025-04-12 (12/04/2025)', 'Saturday, April 12, 2025'),
+        ('Saturday, 2025-02-30 (30/02/2025)', 'Saturday, 2025-02-30'),
+        ('Sat Apr 12 (foo)', 'Sat Apr 12'),
+        ('April 12', 'April 12'),
+        ('', ''),
+    ])
+    def test_format_game_date(self, date_str, expected):
+        """Test that ISO dates are reformatted and other dates lose their parenthesized part"""
+        assert update_website.format_game_date(date_str) == expected
+
+
+class TestFindTrackerRoot:
+    """Test cases for locating the ovechkin_tracker package"""
+
+    def test_finds_the_repository_root(self):
+        """Test that the search walks up from the Lambda directory to the package"""
+        repo_root = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+        assert update_website.find_tracker_root(os.path.abspath(lambda_dir)) == repo_root
+
+    def test_returns_none_without_the_package(self, tmp_path):
+        """Test that None is returned when no parent directory has the package"""
+        assert update_website.find_tracker_root(str(tmp_path)) is None
+
+
+class TestUpdateWebsite:
+    """Test cases for writing the generated page"""
+
+    def test_writes_index_with_imported_stats(self, tmp_path, monkeypatch):
+        """Test that the stats come from the OvechkinData class imported at load"""
+        monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+        monkeypatch.setattr(update_website, 'SCRIPT_DIR', str(tmp_path))
+        ovechkin_data = MagicMock()
+        ovechkin_data.return_value.get_all_stats.return_value = make_stats()
+        monkeypatch.setattr(update_website, 'OvechkinData', ovechkin_data)
+
+        assert update_website.update_website() is True
+
+        assert '890' in (tmp_path / 'static' / 'index.html').read_text()
+        ovechkin_data.return_value.get_all_stats.assert_called_once_with()
+
+    @pytest.fixture
+    def site(self, tmp_path, monkeypatch):
+        """Point the generator at a temporary directory with mocked stats"""
+        monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+        monkeypatch.setattr(update_website, 'SCRIPT_DIR', str(tmp_path))
+        ovechkin_data = MagicMock()
+        ovechkin_data.return_value.get_all_stats.return_value = make_stats()
+        monkeypatch.setattr(update_website, 'OvechkinData', ovechkin_data)
+        return tmp_path, ovechkin_data
+
+    def test_unchanged_stats_leave_the_page_alone(self, site):
+        """Test that the page is only rewritten when the stats it shows change"""
+        tmp_path, ovechkin_data = site
+        index_path = tmp_path / 'static' / 'index.html'
+
+        update_website.update_website()
+        written = index_path.stat().st_mtime_ns
+        assert (tmp_path / update_website.PAGE_SIGNATURE_NAME).exists()
+        update_website.update_website()
+        assert index_path.stat().st_mtime_ns == written
+
+        ovechkin_data.return_value.get_all_stats.return_value = make_stats(**{'Total Number of Goals': 891})
+        update_website.update_website()
+        assert '891' in index_path.read_text()
+
+    def test_page_from_another_writer_is_replaced(self, site):
+        """Test that a page written by something else, such as celebrate.py, is not kept"""
+        tmp_path, _ = site
+        index_path = tmp_path / 'static' / 'index.html'
+
+        update_website.update_website()
+        index_path.write_text("celebration")
+        update_website.update_website()
+
+        assert '890' in index_path.read_text()
+
+    def test_old_page_is_rewritten(self, site):
+        """Test that an unchanged page is still rewritten once it is older than MAX_PAGE_AGE"""
+        tmp_path, _ = site
+        index_path = tmp_path / 'static' / 'index.html'
+        signature_path = tmp_path / update_website.PAGE_SIGNATURE_NAME
+
+        update_website.update_website()
+        signature = signature_path.read_text().split()[0]
+        stale = time.time() - update_website.MAX_PAGE_AGE - 1
+        os.utime(index_path, (stale, stale))
+        update_website.write_page_signature(str(index_path), str(signature_path), signature)
+        update_website.update_website()
+
+        assert index_path.stat().st_mtime > stale + 1
+
+    def test_retries_the_import_from_the_package_root(self, monkeypatch):
+        """Test that a failed import at load is retried from the directory containing the package"""
+        monkeypatch.setattr(update_website, 'OvechkinData', None)
+        monkeypatch.setattr(update_website.sys, 'path', list(update_website.sys.path))
+
+        ovechkin_data = update_website.load_ovechkin_data()
+
+        assert ovechkin_data is not None and ovechkin_data.__name__ == 'OvechkinData'
+
+
+class TestCopyIfChanged:
+    """Test cases for copying the favicon only when needed"""
+
+    def test_copies_once_until_the_source_changes(self, tmp_path):
+        """Test that an up-to-date copy is left alone and a changed source is copied again"""
+        source = tmp_path / 'gr8.svg'
+        target = tmp_path / 'copy.svg'
+        source.write_text("<svg></svg>")
+
+        assert update_website.copy_if_changed(str(source), str(target)) is True
+        assert update_website.copy_if_changed(str(source), str(target)) is False
+
+        source.write_text("<svg>new</svg>")
+        assert update_website.copy_if_changed(str(source), str(target)) is True
+        assert target.read_text() == "<svg>new</svg>"
+
+
+class TestSubprocessFallback:
+    """Test cases for getting the stats from a separate process"""
+
+    def test_failed_process_fails_the_update(self, tmp_path, monkeypatch):
+        """Test that the update reports failure when neither import nor subprocess works"""
+        import subprocess
+        monkeypatch.setattr(update_website, 'SCRIPT_DIR', str(tmp_path))
+        monkeypatch.setattr(update_website, 'load_ovechkin_data', lambda: None)
+        monkeypatch.setattr(subprocess, 'run', MagicMock(
+            side_effect=subprocess.CalledProcessError(1, 'python3', stderr="No module named 'ovechkin_tracker'")
+        ))
+
+        assert update_website.update_website() is False
+        assert not (tmp_path / 'static' / 'index.html').exists()
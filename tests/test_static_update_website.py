@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the Static Website Generator
+
+This module tests aws-static-website/update_website.py, which writes the
+site's index.html from the latest Ovechkin stats.
+"""
+
+import os
+import sys
+import importlib.util
+from unittest.mock import MagicMock
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import the module using importlib since the directory name isn't a valid package name
+module_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'aws-static-website', 'update_website.py')
+spec = importlib.util.spec_from_file_location('static_update_website', module_file)
+update_website = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(update_website)
+
+
+def make_stats(**flat_stats):
+    """Build a stats dictionary shaped like OvechkinData.get_all_stats()"""
+    flat = {'Total Number of Goals': 890, 'Goals to Beat Gretzy': 5}
+    flat.update(flat_stats)
+    return {
+        'flat_stats': flat,
+        'nested_stats': {'record': {'projected_game': {
+            'time': '7:00 PM ET', 'opponent': 'New York Islanders, NY', 'location': 'Home'
+        }}}
+    }
+
+
+class TestUpdateWebsite:
+    """Test cases for writing the generated page"""
+
+    def test_writes_index_with_in_process_stats(self, tmp_path, monkeypatch):
+        """Test that the stats come from the OvechkinData class imported at load"""
+        monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+        monkeypatch.setattr(update_website, 'SCRIPT_DIR', str(tmp_path))
+        ovechkin_data = MagicMock()
+        ovechkin_data.return_value.get_all_stats.return_value = make_stats()
+        monkeypatch.setattr(update_website, 'OvechkinData', ovechkin_data)
+
+        assert update_website.update_website() is True
+
+        html = (tmp_path / 'static' / 'index.html').read_text()
+        assert 'Currently at 890 goals with 5 to go' in html
+        assert 'Record-Breaking Game: Sunday, April 6, 2025, 7:00 PM ET vs New York Islanders (Home)' in html
+
+    def test_failed_import_fails_the_update(self, tmp_path, monkeypatch):
+        """Test that the update reports failure when OvechkinData couldn't be imported"""
+        monkeypatch.setattr(update_website, 'SCRIPT_DIR', str(tmp_path))
+        monkeypatch.setattr(update_website, 'OvechkinData', None)
+
+        assert update_website.update_website() is False
+        assert not (tmp_path / 'static' / 'index.html').exists()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for the Website Updater Lambda Function
+
+This module tests the S3 upload logic of the Lambda function using mocked
+boto3 clients so that no AWS calls are made.
+"""
+
+import os
+import sys
+import json
+import gzip
+import hashlib
+import pytest
+from unittest.mock import MagicMock
+import importlib.util
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import the Lambda module using importlib since it lives outside of a package
+lambda_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'aws-static-website', 'lambda')
+lambda_file = os.path.join(lambda_dir, 'update_website_lambda.py')
+spec = importlib.util.spec_from_file_location('update_website_lambda', lambda_file)
+update_website_lambda = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(update_website_lambda)
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Create a static site directory with a page and an asset"""
+    directory = tmp_path / 'static'
+    (directory / 'assets').mkdir(parents=True)
+    (directory / 'index.html').write_text("<html></html>")
+    (directory / 'assets' / 'gr8.svg').write_text("<svg></svg>")
+    return directory
+
+
+class TestLambdaHandler:
+    """Test cases for the handler's end-to-end flow"""
+
+    def test_generates_uploads_and_invalidates(self, monkeypatch):
+        """Test that the site is generated, uploaded and its changed paths invalidated"""
+        monkeypatch.setenv('AWS_REGION', 'us-east-1')
+        monkeypatch.setattr(update_website_lambda, 'get_stack_outputs', MagicMock(return_value={
+            'WebsiteBucketName': 'bucket',
+            'CloudFrontDistributionId': 'DIST',
+        }))
+        generator = MagicMock()
+        monkeypatch.setattr(update_website_lambda, 'update_website_module', generator)
+        monkeypatch.setattr(update_website_lambda, 'upload_static_files', MagicMock(return_value=['index.html']))
+        clients = {}
+        monkeypatch.setattr(
+            update_website_lambda, 'get_client',
+            lambda service, region=None: clients.setdefault(service, MagicMock())
+        )
+
+        response = update_website_lambda.lambda_handler({}, MagicMock(aws_request_id='request-1'))
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {
+            'message': 'Website updated successfully',
+            'bucket': 'bucket',
+            'celebrationMode': False,
+        }
+        generator.update_website.assert_called_once_with()
+        batch = clients['cloudfront'].create_invalidation.call_args.kwargs['InvalidationBatch']
+        assert batch['Paths'] == {'Quantity': 2, 'Items': ['/index.html', '/']}
+
+
+class TestUploadStaticFiles:
+    """Test cases for uploading the generated site to S3"""
+
+    def test_uploads_every_file_with_its_content_type(self, static_dir):
+        """Test that each file is uploaded under its path relative to the static directory"""
+        s3_client = MagicMock()
+
+        keys = update_website_lambda.upload_static_files(s3_client, 'bucket', str(static_dir))
+
+        assert sorted(keys) == ['assets/gr8.svg', 'index.html']
+        uploads = {call.kwargs['Key']: call.kwargs for call in s3_client.put_object.call_args_list}
+        assert uploads['index.html']['ContentType'] == 'text/html'
+        assert gzip.decompress(uploads['index.html']['Body']) == b"<html></html>"
+        assert uploads['index.html']['ContentEncoding'] == 'gzip'
+        assert uploads['assets/gr8.svg']['ContentType'] == 'image/svg+xml'
+        assert all(upload['Bucket'] == 'bucket' for upload in uploads.values())
+
+    def test_large_files_use_the_transfer_manager(self, static_dir, monkeypatch):
+        """Test that files past the multipart threshold are uploaded from disk"""
+        transfer = MagicMock()
+        monkeypatch.setattr(update_website_lambda, 'S3Transfer', MagicMock(return_value=transfer))
+        monkeypatch.setattr(update_website_lambda.TRANSFER_CONFIG, 'multipart_threshold', 12)
+        s3_client = MagicMock()
+
+        update_website_lambda.upload_static_files(s3_client, 'bucket', str(static_dir))
+
+        # index.html is 13 bytes, gr8.svg is 11
+        transfer.upload_file.assert_called_once()
+        assert transfer.upload_file.call_args.args[2] == 'index.html'
+        assert transfer.upload_file.call_args.kwargs['extra_args'] == {
+            'ContentType': 'text/html',
+            'Metadata': {'content-md5': hashlib.md5(b"<html></html>").hexdigest()},
+        }
+        assert [call.kwargs['Key'] for call in s3_client.put_object.call_args_list] == ['assets/gr8.svg']
+
+    def test_large_files_are_compared_with_their_stored_md5(self, static_dir, monkeypatch):
+        """Test that a multipart object is skipped when the MD5 in its metadata matches the file"""
+        transfer = MagicMock()
+        monkeypatch.setattr(update_website_lambda, 'S3Transfer', MagicMock(return_value=transfer))
+        monkeypatch.setattr(update_website_lambda.TRANSFER_CONFIG, 'multipart_threshold', 12)
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [{'Contents': [
+            {'Key': 'index.html', 'ETag': '"0123456789abcdef-2"'},
+        ]}]
+        s3_client.head_object.return_value = {'Metadata': {'content-md5': hashlib.md5(b"<html></html>").hexdigest()}}
+
+        keys = update_website_lambda.upload_static_files(s3_client, 'bucket', str(static_dir))
+
+        assert keys == ['assets/gr8.svg']
+        transfer.upload_file.assert_not_called()
+        s3_client.head_object.assert_called_once_with(Bucket='bucket', Key='index.html')
+
+    def test_skips_files_matching_their_etag(self, static_dir):
+        """Test that only files whose MD5 differs from the bucket's ETag are uploaded"""
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [{'Contents': [
+            {'Key': 'index.html', 'ETag': '"stale"'},
+            {'Key': 'assets/gr8.svg', 'ETag': '"%s"' % hashlib.md5(
+                gzip.compress(b"<svg></svg>", compresslevel=update_website_lambda.GZIP_LEVEL, mtime=0)
+            ).hexdigest()},
+        ]}]
+
+        keys = update_website_lambda.upload_static_files(s3_client, 'bucket', str(static_dir))
+
+        assert keys == ['index.html']
+        assert [call.kwargs['Key'] for call in s3_client.put_object.call_args_list] == ['index.html']
+
+    def test_binary_files_are_not_compressed(self, tmp_path):
+        """Test that already-compressed formats are uploaded as they are"""
+        (tmp_path / 'favicon.png').write_bytes(b"\x89PNG")
+        s3_client = MagicMock()
+
+        update_website_lambda.upload_static_files(s3_client, 'bucket', str(tmp_path))
+
+        upload = s3_client.put_object.call_args.kwargs
+        assert upload['Body'] == b"\x89PNG"
+        assert 'ContentEncoding' not in upload
+
+
+class TestFileMd5:
+    """Test cases for hashing files on disk"""
+
+    def test_matches_hashing_the_whole_file(self, tmp_path):
+        """Test that the streamed digest equals the MD5 of the file's bytes"""
+        data = os.urandom(3 * 1024 * 1024 + 7)
+        (tmp_path / 'large.bin').write_bytes(data)
+        assert update_website_lambda.file_md5(str(tmp_path / 'large.bin')) == hashlib.md5(data).hexdigest()
+
+
+class TestGetClient:
+    """Test cases for reusing boto3 clients across invocations"""
+
+    def test_clients_are_created_once_per_service_and_region(self, monkeypatch):
+        """Test that repeated lookups return the cached client"""
+        monkeypatch.setattr(update_website_lambda, 'aws_clients', {})
+        create_client = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        monkeypatch.setattr(update_website_lambda.boto3, 'client', create_client)
+
+        s3_client = update_website_lambda.get_client('s3', 'us-east-1')
+
+        assert update_website_lambda.get_client('s3', 'us-east-1') is s3_client
+        assert update_website_lambda.get_client('s3', 'us-west-2') is not s3_client
+        assert create_client.call_count == 2
+        assert create_client.call_args.kwargs['config'] is update_website_lambda.AWS_CONFIG
+
+
+class TestCachedLookups:
+    """Test cases for caching SSM parameters and stack outputs across invocations"""
+
+    @pytest.fixture
+    def clients(self, monkeypatch):
+        """Replace the boto3 clients with mocks, one per service"""
+        mocks = {}
+        monkeypatch.setattr(
+            update_website_lambda, 'get_client',
+            lambda service, region=None: mocks.setdefault(service, MagicMock())
+        )
+        monkeypatch.setattr(update_website_lambda, 'stack_outputs_cache', {})
+        update_website_lambda.fetch_parameter.cache_clear()
+        yield mocks
+        update_website_lambda.fetch_parameter.cache_clear()
+
+    def test_stack_is_described_once(self, clients):
+        """Test that stack outputs are looked up once and returned as a dict"""
+        clients['cloudformation'] = MagicMock()
+        clients['cloudformation'].describe_stacks.return_value = {'Stacks': [{'Outputs': [
+            {'OutputKey': 'WebsiteBucketName', 'OutputValue': 'bucket'},
+            {'OutputKey': 'CloudFrontDistributionId', 'OutputValue': 'DIST'},
+        ]}]}
+
+        first = update_website_lambda.get_stack_outputs('static-website', 'us-east-1')
+        second = update_website_lambda.get_stack_outputs('static-website', 'us-east-1')
+
+        assert first == second == {'WebsiteBucketName': 'bucket', 'CloudFrontDistributionId': 'DIST'}
+        clients['cloudformation'].describe_stacks.assert_called_once_with(StackName='static-website')
+
+    def test_parameters_are_cached_but_failures_are_not(self, clients):
+        """Test that a parameter is fetched once, while a failed lookup is retried next time"""
+        clients['ssm'] = MagicMock()
+        clients['ssm'].get_parameter.side_effect = [
+            Exception("throttled"),
+            {'Parameter': {'Value': 'us-east-1'}},
+        ]
+
+        assert update_website_lambda.get_parameter('/region') is None
+        assert update_website_lambda.get_parameter('/region') == 'us-east-1'
+        assert update_website_lambda.get_parameter('/region') == 'us-east-1'
+        assert clients['ssm'].get_parameter.call_count == 2
+
+
+class TestGetInvalidationPaths:
+    """Test cases for choosing which CloudFront paths to invalidate"""
+
+    def test_changed_keys_become_paths(self):
+        """Test that each key is invalidated, plus the root when index.html changed"""
+        paths = update_website_lambda.get_invalidation_paths(['index.html', 'assets/gr8.svg'])
+        assert paths == ['/index.html', '/assets/gr8.svg', '/']
+
+    def test_too_many_keys_invalidate_everything(self):
+        """Test that more keys than fit in one batch fall back to a wildcard"""
+        keys = [f"page{i}.html" for i in range(update_website_lambda.MAX_INVALIDATION_PATHS + 1)]
+        assert update_website_lambda.get_invalidation_paths(keys) == ['/*']
+
+
+class TestGetContentType:
+    """Test cases for choosing the Content-Type of uploaded files"""
+
+    def test_known_and_unknown_extensions(self):
+        """Test that known extensions map to their type and others fall back to binary"""
+        assert update_website_lambda.get_content_type('site/style.CSS') == 'text/css'
+        assert update_website_lambda.get_content_type('data.bin') == 'application/octet-stream'